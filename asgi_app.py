@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+ASGI Serving Mode
+Production server for the web chatbot exposing the same '/', '/ask' and
+'/examples' contract (and '/admin', '/metrics' endpoints) as web_chatbot.py. Matching is CPU-bound, so it runs on
+a bounded worker pool while the event loop keeps accepting connections.
+When more requests are in flight than the server is allowed to hold, new
+ones are rejected immediately with 429 instead of queueing without limit.
+
+Run with:
+    uvicorn asgi_app:app --host 0.0.0.0 --port 8000
+"""
+
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+import metrics
+from web_chatbot import (answer_question, is_admin_token, knowledge_base, metrics_gauges, profiler,
+                         parse_profile_limit, request_reload, requested_profile_modes, start_faq_watcher,
+                         EXAMPLE_QUESTIONS)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Threads running the matcher, and requests allowed in flight (running + waiting)
+MATCH_WORKERS = int(os.environ.get('CHATBOT_MATCH_WORKERS', min(8, os.cpu_count() or 1)))
+MAX_IN_FLIGHT = int(os.environ.get('CHATBOT_MAX_IN_FLIGHT', MATCH_WORKERS * 8))
+
+# Largest accepted /ask request body
+MAX_BODY_BYTES = 64 * 1024
+
+class ChatbotApp:
+    """Minimal ASGI application serving the chatbot."""
+    
+    def __init__(self, workers=MATCH_WORKERS, max_in_flight=MAX_IN_FLIGHT):
+        """
+        Initialize the application.
+        
+        Args:
+            workers (int): Size of the matcher worker pool
+            max_in_flight (int): Maximum concurrent /ask requests before answering 429
+        """
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='matcher')
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.rejected = 0
+        
+        with open(os.path.join(BASE_DIR, 'templates', 'index.html'), 'rb') as f:
+            self.index_html = f.read()
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+        
+        path, method = scope['path'], scope['method']
+        
+        if path == '/' and method == 'GET':
+            await self.send_response(send, 200, self.index_html, 'text/html; charset=utf-8')
+        elif path == '/examples' and method == 'GET':
+            await self.send_json(send, 200, {'examples': EXAMPLE_QUESTIONS})
+        elif path == '/ask' and method == 'POST':
+            await self.ask(scope, receive, send)
+        elif path == '/metrics' and method == 'GET':
+            gauges = metrics_gauges() + [
+                ('chatbot_requests_in_flight', 'Questions being answered right now', self.in_flight),
+                ('chatbot_requests_rejected', 'Questions rejected with 429 since start-up', self.rejected)
+            ]
+            await self.send_response(send, 200, metrics.render(gauges).encode('utf-8'),
+                                     'text/plain; version=0.0.4; charset=utf-8')
+        elif path.startswith('/admin/'):
+            await self.admin(scope, send)
+        else:
+            await self.send_json(send, 404, {'success': False, 'error': 'Not found.'})
+    
+    async def ask(self, scope, receive, send):
+        """Handle question requests with backpressure."""
+        # The event loop is single-threaded, so the counter needs no lock
+        if self.in_flight >= self.max_in_flight:
+            self.rejected += 1
+            await self.send_json(send, 429, {
+                'success': False,
+                'error': 'The chatbot is busy right now. Please try again in a moment.'
+            }, headers=[(b'retry-after', b'1')])
+            return
+        
+        self.in_flight += 1
+        try:
+            body = await self.read_body(receive)
+            if body is None:
+                await self.send_json(send, 413, {'success': False, 'error': 'Request too large.'})
+                return
+            
+            try:
+                question = json.loads(body or b'{}').get('question', '')
+            except (ValueError, AttributeError):
+                await self.send_json(send, 400, {'success': False, 'error': 'Invalid JSON body.'})
+                return
+            
+            headers = dict(scope['headers'])
+            modes = profiler.select(requested_profile_modes({
+                'X-Profile': headers.get(b'x-profile', b'').decode('latin-1'),
+                'X-Admin-Token': headers.get(b'x-admin-token', b'').decode('latin-1')
+            }))
+            
+            loop = asyncio.get_running_loop()
+            profiled = None
+            try:
+                response, profiled = await loop.run_in_executor(
+                    self.executor, profiler.run, modes, answer_question, question
+                )
+            except Exception as e:
+                response = {
+                    'success': False,
+                    'error': f'Sorry, something went wrong: {str(e)}'
+                }
+            extra_headers = [(b'x-profiled', ','.join(sorted(profiled)).encode('latin-1'))] if profiled else None
+            await self.send_json(send, 200, response, headers=extra_headers)
+        finally:
+            self.in_flight -= 1
+    
+    async def admin(self, scope, send):
+        """Handle the index reload and status endpoints shared with web_chatbot.py."""
+        headers = dict(scope['headers'])
+        if not is_admin_token(headers.get(b'x-admin-token', b'').decode('latin-1')):
+            await self.send_json(send, 403, {'success': False, 'error': 'Not authorized.'})
+        elif scope['path'] == '/admin/reload' and scope['method'] == 'POST':
+            started = request_reload()
+            await self.send_json(send, 202, {'success': True, 'started': started, **knowledge_base.status()})
+        elif scope['path'] == '/admin/index' and scope['method'] == 'GET':
+            await self.send_json(send, 200, knowledge_base.status())
+        elif scope['path'] == '/admin/profile' and scope['method'] == 'GET':
+            query = parse_qs(scope.get('query_string', b'').decode('latin-1'), keep_blank_values=True)
+            limit = parse_profile_limit(query.get('limit', [None])[0])
+            if limit is None:
+                await self.send_json(send, 400, {'success': False, 'error': 'limit must be a positive integer.'})
+            else:
+                await self.send_json(send, 200, profiler.summary(limit))
+        elif scope['path'] == '/admin/profile' and scope['method'] == 'DELETE':
+            profiler.reset()
+            await self.send_json(send, 200, {'success': True})
+        else:
+            await self.send_json(send, 404, {'success': False, 'error': 'Not found.'})
+    
+    async def read_body(self, receive):
+        """Read the request body, returning None if it exceeds MAX_BODY_BYTES."""
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > MAX_BODY_BYTES:
+                return None
+            chunks.append(chunk)
+            if not message.get('more_body'):
+                return b''.join(chunks)
+    
+    async def lifespan(self, receive, send):
+        """Handle server start-up and shutdown."""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                start_faq_watcher()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    
+    async def send_json(self, send, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        await self.send_response(send, status, body, 'application/json', headers)
+    
+    async def send_response(self, send, status, body, content_type, headers=None):
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [
+                (b'content-type', content_type.encode('ascii')),
+                (b'content-length', str(len(body)).encode('ascii'))
+            ] + (headers or [])
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+app = ChatbotApp()
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host='0.0.0.0', port=8000)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Approximate Nearest Neighbour Benchmark
+This script compares the IVF engine of the embedding backend with exact
+(brute-force) embedding search on synthetic corpora: recall@k of the IVF
+results against the exact top k, and queries per second on one CPU, for
+several numbers of probed lists.
+
+The embedding backend needs a spaCy model with word vectors:
+    python -m spacy download en_core_web_md
+"""
+
+import sys
+import time
+from matcher import FAQMatcher
+from preprocess import preprocess_faqs
+from synthetic_faqs import generate_faqs, generate_questions
+
+CORPUS_SIZES = [10000, 100000]
+NPROBES = [1, 4, 8, 16, 32]
+
+def run_queries(matcher, user_vectors, top_k):
+    """Return queries per second and the result indices of each query."""
+    start = time.perf_counter()
+    results = [matcher._search(user_vector, top_k)[0] for user_vector in user_vectors]
+    return len(user_vectors) / (time.perf_counter() - start), results
+
+def recall_at_k(results, exact_results, top_k):
+    """Share of the exact top k FAQs that were also returned, over all queries."""
+    found = sum(len(set(result) & set(exact)) for result, exact in zip(results, exact_results))
+    return found / (top_k * len(exact_results))
+
+def benchmark_ann(sizes=CORPUS_SIZES, nprobes=NPROBES, queries=500, top_k=10):
+    """Run the benchmark and print the results."""
+    print("🧭 Approximate Nearest Neighbour Benchmark")
+    print("=" * 60)
+    
+    for size in sizes:
+        faqs = preprocess_faqs(generate_faqs(size))
+        exact = FAQMatcher(faqs, backend='embedding')
+        start = time.perf_counter()
+        ivf = FAQMatcher(faqs, backend='embedding', engine='ivf')
+        build_seconds = time.perf_counter() - start
+        
+        processed_questions = exact.preprocessor.process_many(generate_questions(queries))
+        user_vectors = [exact._vectorize([question]) for question in processed_questions]
+        exact_qps, exact_results = run_queries(exact, user_vectors, top_k)
+        
+        print(f"{size} FAQs, {ivf._ivf_index.nlist} lists, built in {build_seconds:.2f} s")
+        print(f"{'nprobe':>8} {f'recall@{top_k}':>12} {'QPS':>10} {'speed-up':>10}")
+        print("-" * 60)
+        print(f"{'exact':>8} {1.0:>12.3f} {exact_qps:>10.0f} {1.0:>9.1f}x")
+        for nprobe in nprobes:
+            ivf.ivf_nprobe = nprobe
+            qps, results = run_queries(ivf, user_vectors, top_k)
+            recall = recall_at_k(results, exact_results, top_k)
+            print(f"{nprobe:>8} {recall:>12.3f} {qps:>10.0f} {qps / exact_qps:>9.1f}x")
+        print()
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or CORPUS_SIZES
+    benchmark_ann(sizes)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Matcher Backend Benchmark
+This script compares the TF-IDF backend of FAQMatcher with the dense
+embedding backend (float32 and float16 storage): top-1 accuracy on
+paraphrased questions against faqs.py, and query latency on synthetic
+corpora of increasing size.
+
+The embedding backend needs a spaCy model with word vectors:
+    python -m spacy download en_core_web_md
+"""
+
+import sys
+import time
+from matcher import FAQMatcher
+from preprocess import preprocess_faqs
+from synthetic_faqs import generate_faqs, generate_questions
+
+CORPUS_SIZES = [1000, 10000, 100000]
+
+# Backend configurations: (label, FAQMatcher arguments)
+CONFIGURATIONS = [
+    ('tfidf', {'backend': 'tfidf'}),
+    ('embedding f32', {'backend': 'embedding', 'embedding_dtype': 'float32'}),
+    ('embedding f16', {'backend': 'embedding', 'embedding_dtype': 'float16'})
+]
+
+# Paraphrased user questions and the faqs.py question they should match
+PARAPHRASES = [
+    ("I forgot my password, how do I reset it?", "How can I reset my password?"),
+    ("I can't log in to my account", "How can I reset my password?"),
+    ("What time are you open?", "What are your business hours?"),
+    ("When do you close?", "What are your business hours?"),
+    ("Where is my order?", "How do I track my order?"),
+    ("Where is my package right now?", "How do I track my order?"),
+    ("Can I return this item?", "What is your return policy?"),
+    ("Do you deliver to other countries?", "Do you ship internationally?"),
+    ("Can I get my stuff sent abroad?", "Do you ship internationally?"),
+    ("How do I contact customer service?", "How can I contact customer support?"),
+    ("Is there a phone number I can call?", "How can I contact customer support?"),
+    ("What credit cards do you accept?", "What payment methods do you accept?"),
+    ("Can I pay with PayPal?", "What payment methods do you accept?"),
+    ("How long will delivery take?", "How long does shipping take?"),
+    ("I want to cancel my order", "Can I cancel my order?"),
+    ("Do you give discounts for large orders?", "Do you offer discounts for bulk orders?"),
+    ("Can I get my money back?", "Can I get a refund instead of a replacement?"),
+    ("My package came broken", "What if my item arrives damaged?"),
+    ("How do I stop getting your newsletters?", "How do I unsubscribe from marketing emails?"),
+    ("Will you set the product up for me?", "Do you offer installation services?")
+]
+
+def measure_accuracy(options, threshold=0.1):
+    """
+    Score the paraphrases against faqs.py.
+    
+    Returns:
+        tuple: (top-1 accuracy, share of questions without a match)
+    """
+    matcher = FAQMatcher(**options)
+    matches = matcher.get_best_matches([question for question, _ in PARAPHRASES], threshold=threshold)
+    correct = sum(1 for match, (_, expected) in zip(matches, PARAPHRASES) if match and match['question'] == expected)
+    unmatched = sum(1 for match in matches if match is None)
+    return correct / len(PARAPHRASES), unmatched / len(PARAPHRASES)
+
+def measure_latency(faqs, options, questions, top_k=3):
+    """Return the mean milliseconds to vectorize and search one preprocessed question."""
+    matcher = FAQMatcher(faqs, **options)
+    start = time.perf_counter()
+    for question in questions:
+        matcher._search(matcher._vectorize([question]), top_k)
+    return (time.perf_counter() - start) * 1000 / len(questions)
+
+def benchmark_backends(sizes=CORPUS_SIZES, queries=200):
+    """Run the benchmark and print the results."""
+    print("🧭 Matcher Backend Benchmark")
+    print("=" * 60)
+    print(f"{'backend':<16} {'top-1 accuracy':>15} {'no match':>10}")
+    print("-" * 60)
+    for label, options in CONFIGURATIONS:
+        accuracy, unmatched = measure_accuracy(options)
+        print(f"{label:<16} {accuracy:>15.0%} {unmatched:>10.0%}")
+    
+    print()
+    print(f"{'FAQs':>8} " + ' '.join(f"{label + ' ms':>16}" for label, _ in CONFIGURATIONS))
+    print("-" * 60)
+    for size in sizes:
+        faqs = preprocess_faqs(generate_faqs(size))
+        questions = FAQMatcher(faqs[:1]).preprocessor.process_many(generate_questions(queries))
+        latencies = [measure_latency(faqs, options, questions) for _, options in CONFIGURATIONS]
+        print(f"{size:>8} " + ' '.join(f"{latency:>16.3f}" for latency in latencies))
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or CORPUS_SIZES
+    benchmark_backends(sizes)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Scoring Engine Benchmark
+This script compares the brute-force and inverted-index engines of
+FAQMatcher on synthetic corpora of increasing size, checking that both
+return the same top-k results.
+"""
+
+import sys
+import time
+import numpy as np
+from matcher import FAQMatcher
+from preprocess import preprocess_faqs
+from synthetic_faqs import generate_faqs, generate_questions
+
+CORPUS_SIZES = [1000, 10000, 100000]
+
+def time_search(matcher, user_vectors, top_k):
+    """Return the mean search latency in milliseconds and the results."""
+    start = time.perf_counter()
+    results = [matcher._search(user_vector, top_k) for user_vector in user_vectors]
+    return (time.perf_counter() - start) * 1000 / len(user_vectors), results
+
+def benchmark_engines(sizes=CORPUS_SIZES, queries=200, top_k=3):
+    """Run the benchmark and print the results."""
+    print("🔎 Scoring Engine Benchmark")
+    print("=" * 60)
+    print(f"{'FAQs':>8} {'brute ms/query':>15} {'inverted ms/query':>18} {'identical':>10}")
+    print("-" * 60)
+    
+    for size in sizes:
+        faqs = preprocess_faqs(generate_faqs(size))
+        brute = FAQMatcher(faqs, engine='brute')
+        inverted = FAQMatcher(faqs, engine='inverted')
+        
+        processed_questions = brute.preprocessor.process_many(generate_questions(queries))
+        user_vectors = [brute.vectorizer.transform([question]) for question in processed_questions]
+        
+        brute_ms, brute_results = time_search(brute, user_vectors, top_k)
+        inverted_ms, inverted_results = time_search(inverted, user_vectors, top_k)
+        
+        identical = all(
+            np.array_equal(b_indices, i_indices) and np.allclose(b_scores, i_scores)
+            for (b_indices, b_scores), (i_indices, i_scores) in zip(brute_results, inverted_results)
+        )
+        
+        print(f"{size:>8} {brute_ms:>15.3f} {inverted_ms:>18.3f} {str(identical):>10}")
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or CORPUS_SIZES
+    benchmark_engines(sizes)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+FAQ Store Memory Benchmark
+This script compares the memory held by FAQs kept as a list of per-FAQ
+dicts with the columnar FAQStore, and the memory and time it takes to
+build match results as dict copies versus MatchResult objects.
+
+Usage:
+    python benchmark_faq_store.py [FAQS]
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+from faq_store import FAQStore, MatchResult
+from preprocess import preprocess_faqs
+from synthetic_faqs import generate_faqs
+
+CORPUS_SIZE = 100000
+RESULTS = 10000
+
+def traced(build):
+    """
+    Run build() under tracemalloc.
+    
+    Returns:
+        tuple: (bytes still allocated afterwards, peak bytes, result)
+    """
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, peak, result
+
+def legacy_result(faqs, index, score, user_question, processed_question):
+    """The dict-copy match result that MatchResult replaces."""
+    result = faqs[index].copy()
+    result['similarity_score'] = score
+    result['user_question'] = user_question
+    result['processed_user_question'] = processed_question
+    return result
+
+def benchmark_faq_store(size=CORPUS_SIZE):
+    """Run the benchmark and print the results."""
+    print("🗄️  FAQ Store Memory Benchmark")
+    print("=" * 60)
+    
+    # Serialized rows, so each layout is built from fresh string objects
+    rows = [json.dumps(faq) for faq in preprocess_faqs(generate_faqs(size))]
+    
+    dict_bytes, dict_peak, faq_dicts = traced(lambda: [json.loads(row) for row in rows])
+    store_bytes, store_peak, store = traced(lambda: FAQStore.from_faqs(json.loads(row) for row in rows))
+    
+    print(f"{size} FAQs")
+    print(f"{'layout':<16} {'held MB':>10} {'peak MB':>10} {'bytes/FAQ':>10}")
+    print("-" * 60)
+    print(f"{'list of dicts':<16} {dict_bytes / 1e6:>10.1f} {dict_peak / 1e6:>10.1f} {dict_bytes / size:>10.0f}")
+    print(f"{'FAQStore':<16} {store_bytes / 1e6:>10.1f} {store_peak / 1e6:>10.1f} {store_bytes / size:>10.0f}")
+    print(f"Reduction: {1 - store_bytes / dict_bytes:.0%}")
+    
+    indices = [i * 7919 % size for i in range(RESULTS)]
+    builders = [
+        ('dict copy', lambda: [legacy_result(faq_dicts, i, 0.5, 'question', 'question') for i in indices]),
+        ('MatchResult', lambda: [MatchResult(store, i, 0.5, 'question', 'question') for i in indices])
+    ]
+    
+    print()
+    print(f"{'match result':<16} {'bytes/result':>13} {'µs/result':>10}")
+    print("-" * 60)
+    for name, build in builders:
+        held, _, _ = traced(build)
+        start = time.perf_counter()
+        build()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<16} {held / RESULTS:>13.0f} {elapsed * 1e6 / RESULTS:>10.2f}")
+
+if __name__ == "__main__":
+    benchmark_faq_store(int(sys.argv[1]) if len(sys.argv) > 1 else CORPUS_SIZE)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Metrics Overhead Benchmark
+This script measures what the stage timers cost on the get_best_match hot
+path: the latency with metrics disabled and enabled, and the cost of the
+disabled start()/lap() calls of one question as a share of its latency.
+"""
+
+import sys
+import time
+import metrics
+from matcher import FAQMatcher
+from preprocess import preprocess_faqs
+from synthetic_faqs import generate_faqs, generate_questions
+
+CORPUS_SIZES = [1000, 10000]
+
+# start()/lap() pairs on the get_best_match path: preprocess, tokenize,
+# lemmatize, vectorize + similarity, result
+TIMERS_PER_QUESTION = 5
+
+def time_questions(matcher, questions, rounds=7):
+    """
+    Time get_best_match with metrics disabled and enabled.
+    
+    Rounds alternate between the two modes, so both see the same machine
+    state, and the fastest round of each mode is kept.
+    
+    Returns:
+        tuple: (disabled, enabled) mean latency in microseconds
+    """
+    best = {False: float('inf'), True: float('inf')}
+    for _ in range(rounds):
+        for enabled in (False, True):
+            metrics.enable(enabled)
+            start = time.perf_counter()
+            for question in questions:
+                matcher.get_best_match(question)
+            best[enabled] = min(best[enabled], (time.perf_counter() - start) * 1e6 / len(questions))
+    metrics.enable(False)
+    return best[False], best[True]
+
+def disabled_timer_cost(calls=1000000):
+    """Return the cost in microseconds of one disabled start()/lap() pair."""
+    metrics.enable(False)
+    start = time.perf_counter()
+    for _ in range(calls):
+        metrics.lap('stage', metrics.start())
+    return (time.perf_counter() - start) * 1e6 / calls
+
+def benchmark_metrics(sizes=CORPUS_SIZES, queries=500):
+    """Run the benchmark and print the results."""
+    print("⏱️ Metrics Overhead Benchmark")
+    print("=" * 70)
+    timer_us = disabled_timer_cost()
+    print(f"Disabled start()/lap() pair: {timer_us * 1000:.0f} ns")
+    print()
+    print(f"{'FAQs':>8} {'disabled µs':>12} {'enabled µs':>11} {'enabled cost':>13} {'disabled cost':>14}")
+    print("-" * 70)
+    
+    for size in sizes:
+        matcher = FAQMatcher(preprocess_faqs(generate_faqs(size)))
+        questions = generate_questions(queries)
+        
+        time_questions(matcher, questions, rounds=1)
+        disabled_us, enabled_us = time_questions(matcher, questions)
+        metrics.reset()
+        
+        enabled_cost = (enabled_us - disabled_us) / disabled_us
+        disabled_cost = TIMERS_PER_QUESTION * timer_us / disabled_us
+        print(f"{size:>8} {disabled_us:>12.1f} {enabled_us:>11.1f} {enabled_cost:>13.2%} {disabled_cost:>14.3%}")
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or CORPUS_SIZES
+    benchmark_metrics(sizes)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Parallel Index Build Benchmark
+This script measures how FAQ preprocessing during an index build scales
+with the number of worker processes, and how the task chunk size affects
+it, checking that every configuration produces the serial result.
+
+The synthetic corpus reuses a small vocabulary that would fit entirely in
+the lemma cache, so the cache is disabled to model the lemmatization cost
+of a large help-center export.
+
+Usage:
+    python benchmark_parallel_build.py [FAQS]
+"""
+
+import os
+import sys
+import time
+from preprocess import Preprocessor, PreprocessPool, preprocess_faqs
+from synthetic_faqs import generate_faqs
+
+CORPUS_SIZE = 100000
+CHUNK_SIZES = [100, 500, 2000]
+
+def worker_counts():
+    """Return 1, 2, 4, ... up to the CPU count."""
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 < cpus:
+        counts.append(counts[-1] * 2)
+    if cpus > 1:
+        counts.append(cpus)
+    return counts
+
+def time_build(faqs, preprocessor, workers, chunk_size):
+    """
+    Preprocess the FAQs with a pool of the given size.
+    
+    Returns:
+        tuple: (elapsed seconds, preprocessed FAQs)
+    """
+    start = time.perf_counter()
+    with PreprocessPool(workers, chunk_size, preprocessor) as pool:
+        processed = preprocess_faqs(faqs, pool)
+    return time.perf_counter() - start, processed
+
+def benchmark_parallel_build(size=CORPUS_SIZE):
+    """Run the benchmark and print the results."""
+    print("🏗️  Parallel Index Build Benchmark")
+    print("=" * 60)
+    
+    faqs = generate_faqs(size)
+    preprocessor = Preprocessor(lemma_cache_size=0)
+    preprocessor.warm_up()
+    
+    serial_time, expected = time_build(faqs, preprocessor, 1, CHUNK_SIZES[0])
+    print(f"{size} FAQs, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'chunk':>7} {'seconds':>9} {'FAQs/sec':>12} {'speedup':>8} {'identical':>10}")
+    print("-" * 60)
+    print(f"{1:>8} {'-':>7} {serial_time:>9.2f} {size / serial_time:>12,.0f} {1.0:>7.2f}x {'True':>10}")
+    
+    configurations = [(workers, 500) for workers in worker_counts()[1:]]
+    configurations += [(worker_counts()[-1], chunk_size) for chunk_size in CHUNK_SIZES if chunk_size != 500]
+    
+    for workers, chunk_size in configurations:
+        elapsed, processed = time_build(faqs, preprocessor, workers, chunk_size)
+        identical = processed == expected
+        print(f"{workers:>8} {chunk_size:>7} {elapsed:>9.2f} {size / elapsed:>12,.0f} "
+              f"{serial_time / elapsed:>7.2f}x {str(identical):>10}")
+
+if __name__ == "__main__":
+    benchmark_parallel_build(int(sys.argv[1]) if len(sys.argv) > 1 else CORPUS_SIZE)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Preprocessing Microbenchmark
+This script compares tokens/sec of the original per-call preprocessing
+(stopword set rebuilt, regex looked up and every token lemmatized on each
+call) with the shared Preprocessor pipeline.
+"""
+
+import re
+import time
+from faqs import faqs
+from preprocess import Preprocessor, resources
+
+def legacy_preprocess_text(text):
+    """The original preprocess_text implementation, kept as the baseline."""
+    from nltk.corpus import stopwords
+    
+    if not text or not isinstance(text, str):
+        return ""
+    text = text.lower()
+    text = re.sub(r'[^\w\s]', '', text)
+    tokens = text.split()
+    stop_words = set(stopwords.words('english'))
+    tokens = [token for token in tokens if token not in stop_words]
+    lemmatizer = resources.get('lemmatizer')
+    tokens = [lemmatizer.lemmatize(token) for token in tokens]
+    return ' '.join(tokens)
+
+def build_corpus(repeats=50):
+    """Build a corpus of realistic questions and answer sentences."""
+    texts = []
+    for faq in faqs:
+        texts.append(faq['question'])
+        texts.extend(sentence for sentence in faq['answer'].split('. ') if sentence)
+    return texts * repeats
+
+def measure(process, texts):
+    """
+    Run a preprocessing function over texts.
+    
+    Returns:
+        tuple: (elapsed seconds, tokens/sec)
+    """
+    tokens = sum(len(text.split()) for text in texts)
+    start = time.perf_counter()
+    for text in texts:
+        process(text)
+    elapsed = time.perf_counter() - start
+    return elapsed, tokens / elapsed
+
+def benchmark_preprocess(repeats=50):
+    """Run the benchmark and print the results."""
+    print("⚡ Preprocessing Microbenchmark")
+    print("=" * 50)
+    
+    texts = build_corpus(repeats)
+    preprocessor = Preprocessor()
+    
+    # Warm up resources so load time is not counted
+    legacy_preprocess_text(texts[0])
+    preprocessor.process(texts[0])
+    
+    # Make sure both pipelines agree before comparing speed
+    mismatches = sum(1 for text in texts[:len(faqs) * 5]
+                     if legacy_preprocess_text(text) != preprocessor.process(text))
+    
+    legacy_time, legacy_rate = measure(legacy_preprocess_text, texts)
+    new_time, new_rate = measure(preprocessor.process, texts)
+    
+    start = time.perf_counter()
+    preprocessor.process_many(texts)
+    many_time = time.perf_counter() - start
+    
+    print(f"Texts: {len(texts)}  Mismatches: {mismatches}")
+    print("-" * 50)
+    print(f"Before (preprocess per call): {legacy_rate:12,.0f} tokens/sec ({legacy_time:.3f}s)")
+    print(f"After  (Preprocessor):        {new_rate:12,.0f} tokens/sec ({new_time:.3f}s)")
+    print(f"After  (process_many):        {len(texts) / many_time:12,.0f} texts/sec ({many_time:.3f}s)")
+    print(f"Speedup: {legacy_time / new_time:.1f}x")
+    print(f"Lemma cache: {preprocessor.cache_info()}")
+
+if __name__ == "__main__":
+    benchmark_preprocess()
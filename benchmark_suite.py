@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Matching Pipeline Benchmark Suite
+This script measures the whole matching pipeline on synthetic corpora of
+1k and 10k FAQs (100k on request) generated from faqs.py:
+- preprocess_text throughput
+- FAQMatcher build time
+- single-question latency distribution (p50/p95/p99)
+- batch throughput of get_best_matches
+- memory footprint (index size and peak allocations while building)
+
+Results are written as JSON. Given a baseline file from an earlier run, every
+metric is compared against it and the script exits with status 1 if any
+metric got worse by more than its tolerance, and with status 2 if there is
+no baseline to compare against. Sizes with regressions are measured again
+before failing, and only regressions seen in both runs count.
+
+Timings only compare on the same machine, so no baseline is committed: CI
+records one from the target branch with --update-baseline first, then runs
+the suite on the change.
+
+    python benchmark_suite.py --update-baseline        # record benchmark_baseline.json
+    python benchmark_suite.py                          # compare against it
+    python benchmark_suite.py --sizes 1000 10000 100000
+    python benchmark_suite.py --sizes 1000 --output results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from matcher import FAQMatcher
+from preprocess import default_preprocessor, preprocess_faqs, preprocess_text
+from synthetic_faqs import generate_faqs, generate_questions
+
+# Sizes measured by default; larger corpora (100000) take minutes and are opt-in via --sizes
+CORPUS_SIZES = [1000, 10000]
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# Metric name -> (unit, True if higher is better, kind); kind selects the tolerance
+METRICS = {
+    'preprocess_texts_per_s': ('texts/s', True, 'time'),
+    'build_s': ('s', False, 'time'),
+    'query_p50_us': ('µs', False, 'time'),
+    'query_p95_us': ('µs', False, 'time'),
+    'query_p99_us': ('µs', False, 'time'),
+    'batch_questions_per_s': ('questions/s', True, 'time'),
+    'index_mb': ('MB', False, 'memory'),
+    'build_peak_mb': ('MB', False, 'memory')
+}
+
+# Allowed relative change for the worse before a metric counts as a regression;
+# timings are noisy, memory is nearly deterministic
+TOLERANCES = {'time': 0.25, 'memory': 0.10}
+
+# Absolute changes below these, by unit, never count as regressions: at this
+# scale the difference is timer and scheduling noise
+NOISE_FLOORS = {'s': 0.01, 'µs': 20.0}
+
+# Repetitions of the build and throughput measurements; the fastest is
+# reported, as short runs are noisy
+ROUNDS = 5
+
+# Each round repeats the measured call until it has run at least this long,
+# so fast operations are not timed from a single short call
+MIN_ROUND_SECONDS = 0.2
+
+# Extra runs of the sizes with regressions before the gate fails
+CONFIRM_RUNS = 1
+
+def index_bytes(matcher):
+    """Bytes held by the fitted FAQ vectors and the FAQ store."""
+    vectors = matcher.faq_vectors
+    return vectors.data.nbytes + vectors.indices.nbytes + vectors.indptr.nbytes + matcher.faqs.nbytes
+
+def best_seconds(function, rounds=ROUNDS, min_round_seconds=MIN_ROUND_SECONDS):
+    """
+    Time function and return its fastest run in seconds.
+    
+    Each round calls function until min_round_seconds have passed and
+    counts the mean time per call; the fastest round is returned.
+    """
+    times = []
+    for _ in range(rounds):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            function()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_round_seconds:
+                break
+        times.append(elapsed / calls)
+    return min(times)
+
+def measure_size(size, queries=500, batch_size=1024):
+    """
+    Run every benchmark on one synthetic corpus.
+    
+    Args:
+        size (int): Number of FAQs
+        queries (int): Questions timed for latency and batch throughput
+        batch_size (int): Questions per get_best_matches call
+    
+    Returns:
+        dict: Metric name -> value, see METRICS
+    """
+    raw_faqs = generate_faqs(size)
+    questions = generate_questions(queries)
+    results = {}
+    
+    # preprocess_text throughput over the corpus questions; the lemma cache is
+    # warm after the first FAQs, as it is in a running server
+    texts = [faq['question'] for faq in raw_faqs]
+    seconds = best_seconds(lambda: [preprocess_text(text) for text in texts])
+    results['preprocess_texts_per_s'] = len(texts) / seconds
+    
+    faqs = preprocess_faqs(raw_faqs)
+    results['build_s'] = best_seconds(lambda: FAQMatcher(faqs))
+    matcher = FAQMatcher(faqs)
+    
+    # Latency distribution of single questions, end to end through get_best_match;
+    # each percentile is the lowest over the rounds
+    matcher.get_best_match(questions[0])
+    percentiles = []
+    for _ in range(ROUNDS):
+        latencies = []
+        for question in questions:
+            start = time.perf_counter()
+            matcher.get_best_match(question)
+            latencies.append(time.perf_counter() - start)
+        percentiles.append(np.percentile(latencies, [50, 95, 99]) * 1e6)
+    p50, p95, p99 = np.min(percentiles, axis=0)
+    results.update({'query_p50_us': p50, 'query_p95_us': p95, 'query_p99_us': p99})
+    
+    seconds = best_seconds(lambda: matcher.get_best_matches(questions, batch_size=batch_size))
+    results['batch_questions_per_s'] = len(questions) / seconds
+    
+    results['index_mb'] = index_bytes(matcher) / 1024 ** 2
+    
+    # Peak Python allocations while building; traced separately since tracing slows the build
+    del matcher
+    tracemalloc.start()
+    FAQMatcher(faqs)
+    results['build_peak_mb'] = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+    tracemalloc.stop()
+    return results
+
+def environment():
+    """Describe the machine and library versions the results were measured with."""
+    import scipy
+    import sklearn
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'sklearn': sklearn.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'timestamp': datetime.now().isoformat(timespec='seconds')
+    }
+
+def run_suite(sizes=CORPUS_SIZES, queries=500):
+    """
+    Run the suite on every corpus size, printing progress.
+    
+    Returns:
+        dict: JSON-serializable results with 'environment' and per-size 'results'
+    """
+    # Load the NLP resources and scikit-learn before anything is timed
+    default_preprocessor.warm_up()
+    FAQMatcher(preprocess_faqs(generate_faqs(10)))
+    
+    results = {}
+    for size in sizes:
+        print(f"Measuring {size} FAQs...")
+        results[str(size)] = measure_size(size, queries)
+    return {'environment': environment(), 'results': results}
+
+def compare(current, baseline, tolerances=TOLERANCES):
+    """
+    Compare results against a baseline, printing one line per metric.
+    
+    Sizes or metrics missing from either side are skipped, and changes within
+    the noise floor of the metric's unit never count as regressions.
+    
+    Returns:
+        list: (size, metric, baseline value, current value) of every regression
+    """
+    regressions = []
+    print(f"{'FAQs':>8} {'metric':<24} {'baseline':>12} {'current':>12} {'change':>9}")
+    print("-" * 70)
+    for size, metrics in current['results'].items():
+        baseline_metrics = baseline['results'].get(size, {})
+        for name, value in metrics.items():
+            if name not in baseline_metrics or name not in METRICS:
+                continue
+            unit, higher_is_better, kind = METRICS[name]
+            reference = baseline_metrics[name]
+            change = (value - reference) / reference if reference else 0.0
+            worse = -change if higher_is_better else change
+            
+            within_noise = abs(value - reference) < NOISE_FLOORS.get(unit, 0.0)
+            
+            status = ''
+            if worse > tolerances[kind] and not within_noise:
+                regressions.append((size, name, reference, value))
+                status = '❌ regression'
+            print(f"{size:>8} {name:<24} {reference:>12.2f} {value:>12.2f} {change:>+9.1%} {status}")
+    return regressions
+
+def best_of(first, second):
+    """Combine two runs, keeping the better value of every metric."""
+    combined = {'environment': first['environment'], 'results': {}}
+    for size, metrics in first['results'].items():
+        other = second['results'].get(size, {})
+        combined['results'][size] = {
+            name: (max if METRICS[name][1] else min)(value, other.get(name, value))
+            for name, value in metrics.items()
+        }
+    return combined
+
+def print_results(results):
+    """Print the results of a run as a table."""
+    for size, metrics in results['results'].items():
+        print(f"\n{size} FAQs:")
+        for name, value in metrics.items():
+            print(f"   {name:<24} {value:>12.2f} {METRICS[name][0]}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the matching pipeline and gate on regressions")
+    parser.add_argument('--sizes', type=int, nargs='+', default=CORPUS_SIZES, help='Corpus sizes to measure')
+    parser.add_argument('--queries', type=int, default=500, help='Questions timed per corpus')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file to compare against')
+    parser.add_argument('--update-baseline', '--save-baseline', action='store_true',
+                        help='Store the results as the new baseline instead of comparing')
+    parser.add_argument('--tolerance', type=float,
+                        help=f"Allowed relative regression of timings (default: {TOLERANCES['time']}; "
+                             f"memory: {TOLERANCES['memory']})")
+    args = parser.parse_args(argv)
+    
+    print("📊 Matching Pipeline Benchmark Suite")
+    print("=" * 70)
+    results = run_suite(args.sizes, args.queries)
+    print_results(results)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+    
+    if not os.path.exists(args.baseline):
+        print(f"\n❌ No baseline at {args.baseline}; run with --update-baseline to record one.")
+        return 2
+    
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    tolerances = dict(TOLERANCES)
+    if args.tolerance is not None:
+        tolerances['time'] = args.tolerance
+    
+    print(f"\nComparison with {args.baseline} (measured {baseline['environment']['timestamp']}):")
+    regressions = compare(results, baseline, tolerances)
+    for _ in range(CONFIRM_RUNS):
+        if not regressions:
+            break
+        sizes = sorted({int(size) for size, _, _, _ in regressions})
+        print(f"\nMeasuring {', '.join(map(str, sizes))} FAQs again to confirm...")
+        results = best_of(results, run_suite(sizes, args.queries))
+        print()
+        regressions = compare(results, baseline, tolerances)
+    
+    if regressions:
+        print(f"\n❌ {len(regressions)} metric(s) regressed beyond tolerance")
+        return 1
+    print("\n✅ No regressions")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
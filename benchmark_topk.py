@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Top-k Retrieval Benchmark
+This script compares the original get_top_matches scoring (cosine_similarity
+plus a full argsort) with the precomputed-normalization dot product and
+argpartition selection, on synthetic corpora of increasing size.
+"""
+
+import sys
+import time
+import numpy as np
+from matcher import FAQMatcher, top_k_indices
+from preprocess import preprocess_faqs
+from synthetic_faqs import generate_faqs, generate_questions
+
+CORPUS_SIZES = [1000, 10000, 100000]
+
+def legacy_top_k(matcher, processed_question, top_k):
+    """The original scoring path: renormalize everything and sort every FAQ."""
+    from sklearn.metrics.pairwise import cosine_similarity
+    
+    user_vector = matcher.vectorizer.transform([processed_question])
+    similarities = cosine_similarity(user_vector, matcher.faq_vectors).flatten()
+    return np.argsort(similarities)[::-1][:top_k]
+
+def optimized_top_k(matcher, processed_question, top_k):
+    """The current scoring path: plain dot product and argpartition."""
+    user_vector = matcher.vectorizer.transform([processed_question])
+    return top_k_indices(matcher._similarities(user_vector), top_k)
+
+def time_queries(function, matcher, processed_questions, top_k):
+    """Return the mean latency in milliseconds of function over the questions."""
+    start = time.perf_counter()
+    for processed_question in processed_questions:
+        function(matcher, processed_question, top_k)
+    return (time.perf_counter() - start) * 1000 / len(processed_questions)
+
+def benchmark_topk(sizes=CORPUS_SIZES, queries=200, top_k=3):
+    """Run the benchmark and print the results."""
+    print("🏁 Top-k Retrieval Benchmark")
+    print("=" * 60)
+    print(f"{'FAQs':>8} {'legacy ms/query':>16} {'optimized ms/query':>19} {'speedup':>8}")
+    print("-" * 60)
+    
+    for size in sizes:
+        matcher = FAQMatcher(preprocess_faqs(generate_faqs(size)))
+        processed_questions = matcher.preprocessor.process_many(generate_questions(queries))
+        
+        legacy_ms = time_queries(legacy_top_k, matcher, processed_questions, top_k)
+        optimized_ms = time_queries(optimized_top_k, matcher, processed_questions, top_k)
+        
+        print(f"{size:>8} {legacy_ms:>16.3f} {optimized_ms:>19.3f} {legacy_ms / optimized_ms:>7.1f}x")
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or CORPUS_SIZES
+    benchmark_topk(sizes)
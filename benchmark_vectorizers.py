@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Vectorizer Benchmark
+This script compares the vocabulary-based TF-IDF vectorizer of FAQMatcher
+(capped at 1000 features) with the hashed TF-IDF vectorizer on synthetic
+corpora: fit time, transform and search latency, vectorizer size, and
+top-1 accuracy on queries made by dropping one word from an FAQ question.
+"""
+
+import pickle
+import random
+import sys
+import time
+from matcher import FAQMatcher
+from preprocess import preprocess_faqs
+from synthetic_faqs import generate_faqs
+
+CORPUS_SIZES = [1000, 10000, 100000]
+
+CONFIGURATIONS = [
+    ('vocabulary', {'backend': 'tfidf'}),
+    ('hashing', {'backend': 'hashing'})
+]
+
+def make_queries(faqs, count, seed=2):
+    """
+    Build queries from random FAQs by dropping one of their words.
+    
+    Returns:
+        list: (processed query, set of FAQ indices with the same processed question) pairs
+    """
+    rng = random.Random(seed)
+    same_question = {}
+    for index, faq in enumerate(faqs):
+        same_question.setdefault(faq['processed_question'], set()).add(index)
+    
+    queries = []
+    for index in rng.sample(range(len(faqs)), min(count, len(faqs))):
+        words = faqs[index]['processed_question'].split()
+        if len(words) > 1:
+            del words[rng.randrange(len(words))]
+        queries.append((' '.join(words), same_question[faqs[index]['processed_question']]))
+    return queries
+
+def vectorizer_bytes(vectorizer):
+    """Size of the fitted vectorizer state: vocabulary (if any) and IDF weights."""
+    vocabulary = getattr(vectorizer, 'vocabulary_', None)
+    return (len(pickle.dumps(vocabulary)) if vocabulary else 0) + vectorizer.idf_.nbytes
+
+def benchmark_vectorizers(sizes=CORPUS_SIZES, queries=500):
+    """Run the benchmark and print the results."""
+    print("🔢 Vectorizer Benchmark")
+    print("=" * 78)
+    print(f"{'FAQs':>8} {'vectorizer':>11} {'fit s':>7} {'features':>9} {'state KB':>9} "
+          f"{'transform µs':>13} {'search ms':>10} {'top-1':>7}")
+    print("-" * 78)
+    
+    # Import scikit-learn and load the NLP resources before anything is timed
+    for _, options in CONFIGURATIONS:
+        FAQMatcher(preprocess_faqs(generate_faqs(10)), **options)
+    
+    for size in sizes:
+        faqs = preprocess_faqs(generate_faqs(size))
+        test_queries = make_queries(faqs, queries)
+        
+        for label, options in CONFIGURATIONS:
+            start = time.perf_counter()
+            matcher = FAQMatcher(faqs, **options)
+            fit_seconds = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            user_vectors = [matcher.vectorizer.transform([query]) for query, _ in test_queries]
+            transform_us = (time.perf_counter() - start) * 1e6 / len(test_queries)
+            
+            start = time.perf_counter()
+            results = [matcher._search(user_vector, 1)[0][0] for user_vector in user_vectors]
+            search_ms = (time.perf_counter() - start) * 1000 / len(test_queries)
+            
+            correct = sum(1 for result, (_, expected) in zip(results, test_queries) if result in expected)
+            used_features = matcher.faq_vectors.getnnz(axis=0).astype(bool).sum()
+            print(f"{size:>8} {label:>11} {fit_seconds:>7.2f} {used_features:>9} "
+                  f"{vectorizer_bytes(matcher.vectorizer) / 1024:>9.0f} {transform_us:>13.1f} "
+                  f"{search_ms:>10.3f} {correct / len(test_queries):>7.1%}")
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or CORPUS_SIZES
+    benchmark_vectorizers(sizes)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Bulk Scoring CLI
+Replays a large CSV or JSONL file of questions against the FAQ matcher and
+writes one JSON line per question with the best match and its score.
+
+The matcher is fitted (or loaded) once in the parent and shared with a pool
+of forked worker processes. Input is read lazily and only a bounded number of
+chunks is in flight, so memory stays constant however large the file is.
+Progress is checkpointed after every chunk, and --resume continues an
+interrupted run where it stopped.
+
+Usage:
+    python bulk_score.py questions.csv matches.jsonl [--column question] [--workers 4]
+    python bulk_score.py chats.jsonl matches.jsonl --resume
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from itertools import islice
+
+from faq_sources import chunked, open_source
+
+# Set in the parent before the pool forks, so workers share one fitted matcher
+_matcher = None
+
+def read_questions(path, column='question', input_format=None):
+    """
+    Stream questions from a CSV or JSONL file.
+    
+    Args:
+        path (str): Input file
+        column (str): CSV column / JSON field holding the question
+        input_format (str): 'csv' or 'jsonl', guessed from the extension if None
+    
+    Yields:
+        tuple: (row number, id or None, question). Rows that are not valid JSON
+               or whose question is not a string (null, a number, a list...)
+               yield an empty question, which matches nothing
+    """
+    input_format = input_format or ('csv' if path.lower().endswith('.csv') else 'jsonl')
+    
+    with open(path, newline='', encoding='utf-8') as f:
+        if input_format == 'csv':
+            for row_number, row in enumerate(csv.DictReader(f)):
+                yield row_number, row.get('id'), row.get(column) or ''
+        else:
+            for row_number, line in enumerate(f):
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    item = ''
+                question_id = None
+                if isinstance(item, dict):
+                    question_id, item = item.get('id'), item.get(column)
+                yield row_number, question_id, item if isinstance(item, str) else ''
+
+def score_chunk(chunk, threshold):
+    """
+    Score a chunk of questions in a worker process.
+    
+    Args:
+        chunk (list): (row number, id, question) tuples
+        threshold (float): Minimum similarity threshold
+    
+    Returns:
+        str: JSON lines for the chunk
+    """
+    matches = _matcher.get_best_matches([question for _, _, question in chunk], threshold=threshold)
+    lines = []
+    for (row_number, question_id, question), match in zip(chunk, matches):
+        lines.append(json.dumps({
+            'row': row_number,
+            'id': question_id,
+            'question': question,
+            'matched_question': match['question'] if match else None,
+            'similarity_score': round(float(match['similarity_score']), 4) if match else 0.0
+        }))
+    return ''.join(line + '\n' for line in lines)
+
+def read_checkpoint(path):
+    """Return the saved checkpoint, or None if there is none."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_checkpoint(path, rows_done, output_bytes):
+    """Atomically record how many rows and output bytes are complete."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'rows_done': rows_done, 'output_bytes': output_bytes}, f)
+    os.replace(tmp_path, path)
+
+def load_matcher(index_path=None, source_path=None):
+    """
+    Load the matcher to score against.
+    
+    An index directory given by the caller is only ever read, never rebuilt.
+    
+    Args:
+        index_path (str): Saved index to score against as it is. With source_path,
+                          it must have been built from that source
+        source_path (str): FAQ source file (see faq_sources.open_source) to score
+                           against; fitted in memory unless index_path is given
+    
+    Returns:
+        FAQMatcher: Fitted matcher
+    
+    Raises:
+        ValueError: If index_path is missing, stale or built from other FAQs
+    """
+    from faq_index import load_index
+    from matcher import FAQMatcher
+    
+    source = open_source(source_path) if source_path else None
+    if index_path is None:
+        if source is not None:
+            return FAQMatcher(source=source)
+        # The FAQs in faqs.py, from the default index (rebuilt if stale)
+        return FAQMatcher.load()
+    
+    index = load_index(index_path, source.content_hash() if source is not None else None)
+    if index is None:
+        problem = f"was not built from {source_path}" if source is not None else "is missing or from an older format"
+        raise ValueError(f"Index {index_path} {problem}; rebuild it with faq_index.py")
+    return FAQMatcher(index=index)
+
+def bulk_score(input_path, output_path, column='question', input_format=None, workers=None,
+               chunk_size=2000, threshold=0.1, index_path=None, resume=False, report_every=5.0,
+               source_path=None, matcher=None):
+    """
+    Score every question of the input file and write the results.
+    
+    See load_matcher() for index_path and source_path; a matcher the caller
+    has already loaded is used instead of them.
+    
+    Returns:
+        int: Number of questions scored in this run
+    """
+    global _matcher
+    
+    checkpoint_path = f"{output_path}.checkpoint"
+    checkpoint = read_checkpoint(checkpoint_path) if resume else None
+    rows_done = checkpoint['rows_done'] if checkpoint else 0
+    
+    # Fit or load once in the parent; the forked workers inherit it
+    _matcher = matcher or load_matcher(index_path, source_path)
+    _matcher.preprocessor.warm_up()
+    
+    output = open(output_path, 'r+b' if checkpoint else 'wb')
+    if checkpoint:
+        # Drop anything written after the last checkpoint
+        output.truncate(checkpoint['output_bytes'])
+        output.seek(checkpoint['output_bytes'])
+        print(f"Resuming after {rows_done} rows", file=sys.stderr)
+    
+    questions = islice(read_questions(input_path, column, input_format), rows_done, None)
+    workers = workers or os.cpu_count() or 1
+    max_pending = workers * 2
+    
+    scored = 0
+    start = last_report = time.perf_counter()
+    context = multiprocessing.get_context('fork')
+    
+    with context.Pool(workers) as pool, output:
+        pending = deque()
+        chunks = chunked(questions, chunk_size)
+        
+        while True:
+            # Keep a bounded number of chunks in flight to cap memory
+            while len(pending) < max_pending:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                pending.append((len(chunk), pool.apply_async(score_chunk, (chunk, threshold))))
+            if not pending:
+                break
+            
+            # Write results in input order as they complete
+            size, result = pending.popleft()
+            output.write(result.get().encode('utf-8'))
+            output.flush()
+            rows_done += size
+            scored += size
+            write_checkpoint(checkpoint_path, rows_done, output.tell())
+            
+            now = time.perf_counter()
+            if now - last_report >= report_every:
+                print(f"{rows_done} rows done, {scored / (now - start):,.0f} questions/sec", file=sys.stderr)
+                last_report = now
+    
+    elapsed = time.perf_counter() - start
+    print(f"✅ Scored {scored} questions in {elapsed:.1f}s "
+          f"({scored / elapsed if elapsed else 0:,.0f} questions/sec) -> {output_path}", file=sys.stderr)
+    return scored
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score a large file of questions against the FAQs")
+    parser.add_argument('input', help='CSV or JSONL file of questions')
+    parser.add_argument('output', help='JSONL file to write matches to')
+    parser.add_argument('--column', default='question', help='CSV column / JSON field with the question')
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help='Input format (default: from extension)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=2000, help='Questions per worker task')
+    parser.add_argument('--threshold', type=float, default=0.1, help='Minimum similarity threshold')
+    parser.add_argument('--index', help='Saved FAQ index directory to score against as it is '
+                                        '(default: faq_index/ for faqs.py)')
+    parser.add_argument('--source', help='FAQ source file (JSONL, CSV or SQLite) to score against instead of faqs.py')
+    parser.add_argument('--resume', action='store_true', help='Continue from the last checkpoint')
+    args = parser.parse_args()
+    
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    if not os.path.isfile(args.input):
+        parser.error(f"Input file {args.input} does not exist")
+    
+    # Only a bad --index or --source is a usage error; failures while scoring keep their traceback
+    try:
+        matcher = load_matcher(args.index, args.source)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    
+    bulk_score(args.input, args.output, args.column, args.format, args.workers,
+               args.chunk_size, args.threshold, args.index, args.resume, source_path=args.source,
+               matcher=matcher)
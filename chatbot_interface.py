@@ -1,11 +1,12 @@
 from matcher import FAQMatcher
+from query_cache import QueryCache
 import time
 from datetime import datetime
 
 class ChatbotInterface:
     def __init__(self):
         """Initialize the chatbot interface."""
-        self.matcher = FAQMatcher()
+        self.matcher = FAQMatcher(cache=QueryCache(maxsize=1024))
         self.conversation_history = []
         self.session_start = datetime.now()
         
@@ -159,6 +160,9 @@ class ChatbotInterface:
         print(f"   Success Rate: {success_rate:.1f}%")
         print(f"   Successful Matches: {successful_matches}")
         
+        cache_stats = self.matcher.cache.stats()
+        print(f"   Cache Hit Rate: {cache_stats['hit_rate'] * 100:.1f}% ({cache_stats['hits']} hits)")
+        
         return True
         
     def handle_exit(self):
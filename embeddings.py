@@ -0,0 +1,116 @@
+"""
+Dense Embedding Backend
+Encodes preprocessed questions as the normalized sum of their words' static
+vectors (spaCy's word vectors by default), so paraphrases with different
+words but similar meaning ("what time are you open" / "business hours")
+still score as similar. FAQ embeddings are kept in one contiguous float32
+or float16 matrix and scored against a query with a single matrix product.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from preprocess import resources
+
+# Supported storage types of the FAQ embedding matrix
+EMBEDDING_DTYPES = ('float32', 'float16')
+
+# float16 rows are converted to float32 in blocks of this many rows for scoring,
+# since NumPy has no BLAS kernel for half precision
+SCORE_BLOCK_ROWS = 16384
+
+class EmbeddingIndex:
+    """FAQ question embeddings and the encoder used for them and for queries."""
+    
+    def __init__(self, processed_questions, dtype='float32', registry=None, embeddings=None):
+        """
+        Encode the FAQ questions.
+        
+        Args:
+            processed_questions (list): Preprocessed FAQ questions
+            dtype (str): Storage type of the embedding matrix, 'float32' or 'float16'
+            registry (ResourceRegistry): Provides the 'word_vectors' resource,
+                                         defaults to the preprocess registry
+            embeddings (numpy.ndarray): Previously computed embeddings of the questions
+                                        (e.g. memory-mapped from a saved index); skips encoding
+        """
+        if dtype not in EMBEDDING_DTYPES:
+            raise ValueError(f"Unknown embedding dtype '{dtype}', expected one of {EMBEDDING_DTYPES}")
+        
+        self._registry = registry or resources
+        self._vectors = self._registry.get('word_vectors')
+        self._table = np.ascontiguousarray(self._vectors.data, dtype=np.float32)
+        if self._table.size == 0:
+            raise ValueError("The word vectors table is empty; the embedding backend needs a "
+                             "model with static vectors, such as en_core_web_md")
+        self._find_row = lru_cache(maxsize=100000)(self._find_row)
+        
+        self.dtype = dtype
+        if embeddings is not None and embeddings.dtype == np.dtype(dtype):
+            self.embeddings = embeddings
+        else:
+            self.embeddings = np.ascontiguousarray(self.encode(processed_questions), dtype=dtype)
+    
+    @property
+    def dimensions(self):
+        """Length of every embedding."""
+        return self._table.shape[1]
+    
+    def _find_row(self, word):
+        return self._vectors.find(key=word)
+    
+    def encode(self, texts):
+        """
+        Embed preprocessed texts.
+        
+        Words without a vector are ignored; a text with none of them gets an
+        all-zero embedding, which scores 0 against every FAQ.
+        
+        Args:
+            texts (list): Preprocessed texts
+        
+        Returns:
+            numpy.ndarray: len(texts) x dimensions float32 matrix with L2-normalized rows
+        """
+        from scipy.sparse import csr_matrix
+        
+        documents = []
+        rows = []
+        for document, text in enumerate(texts):
+            for word in text.split():
+                row = self._find_row(word)
+                if row >= 0:
+                    documents.append(document)
+                    rows.append(row)
+        
+        # Summing word vectors is a sparse (texts x words) by dense (words x dims) product
+        counts = csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (documents, rows)),
+            shape=(len(texts), self._table.shape[0])
+        )
+        embeddings = np.asarray(counts @ self._table, dtype=np.float32)
+        
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return embeddings / norms
+    
+    def similarities(self, query_embeddings):
+        """
+        Score query embeddings against every FAQ.
+        
+        Args:
+            query_embeddings (numpy.ndarray): n_queries x dimensions matrix from encode()
+        
+        Returns:
+            numpy.ndarray: n_queries x n_faqs cosine similarities
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if self.embeddings.dtype == np.float32:
+            return queries @ self.embeddings.T
+        
+        scores = np.empty((len(queries), len(self.embeddings)), dtype=np.float32)
+        for start in range(0, len(self.embeddings), SCORE_BLOCK_ROWS):
+            block = self.embeddings[start:start + SCORE_BLOCK_ROWS].astype(np.float32)
+            scores[:, start:start + SCORE_BLOCK_ROWS] = queries @ block.T
+        return scores
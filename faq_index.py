@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Persistent FAQ Index
+Saves a fitted FAQMatcher (FAQ texts, vectorizer vocabulary or hash buckets/IDF, the
+sparse FAQ vectors and, for the embedding backend, the FAQ embeddings and
+IVF lists) to a versioned directory on disk, so worker processes can
+memory-map it at start-up instead of preprocessing and refitting TF-IDF.
+The FAQ texts, answers included, stay memory-mapped while serving, so they
+are not copied into the RAM of each worker.
+
+Run this script to build the default index:
+    python faq_index.py [--source help_center.jsonl] [--workers 8] [--engine ivf]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from faq_store import FAQStore
+
+# Bump when the on-disk layout changes; older artifacts are then rebuilt
+INDEX_FORMAT_VERSION = 2
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FAQS_SOURCE = os.path.join(BASE_DIR, 'faqs.py')
+DEFAULT_INDEX_PATH = os.path.join(BASE_DIR, 'faq_index')
+
+# Names of the CSR component arrays stored as .npy files
+MATRIX_ARRAYS = ('data', 'indices', 'indptr')
+
+def faqs_hash(faqs=None):
+    """
+    Compute a content hash identifying a FAQ set.
+    
+    The hash only depends on the questions and answers, so a FAQ set gets
+    the same hash whether it comes from faqs.py or from a list.
+    
+    Args:
+        faqs (list): List of FAQ dictionaries. If None, the FAQs in faqs.py as it is on disk now
+    
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    if faqs is None:
+        return read_faqs_source()[1]
+    digest = hashlib.sha256()
+    for faq in faqs:
+        digest.update(json.dumps([faq['question'], faq['answer']]).encode('utf-8'))
+    return digest.hexdigest()
+
+def read_faqs_source(path=FAQS_SOURCE):
+    """
+    Read the FAQ list from faqs.py as it is on disk now.
+    
+    Unlike importing the faqs module, this sees edits made after start-up.
+    The list and its hash come from the same read of the file.
+    
+    Args:
+        path (str): Python file defining a 'faqs' list
+    
+    Returns:
+        tuple: (list of FAQ dictionaries, their faqs_hash())
+    """
+    with open(path, 'rb') as f:
+        source = f.read()
+    
+    namespace = {}
+    exec(compile(source, path, 'exec'), namespace)
+    return namespace['faqs'], faqs_hash(namespace['faqs'])
+
+def save_index(matcher, path=DEFAULT_INDEX_PATH, source_hash=None):
+    """
+    Save a fitted matcher to disk.
+    
+    The index is written to a temporary directory first and then moved into
+    place, so readers never see a half-written artifact.
+    
+    Args:
+        matcher (FAQMatcher): Fitted matcher to save
+        path (str): Index directory
+        source_hash (str): Content hash of the FAQ set, see faqs_hash()
+    """
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    
+    vectorizer = matcher.vectorizer
+    faq_vectors = matcher.faq_vectors.tocsr()
+    
+    meta = {
+        'version': INDEX_FORMAT_VERSION,
+        'source_hash': source_hash,
+        'shape': list(faq_vectors.shape),
+        'created': time.time()
+    }
+    if hasattr(vectorizer, 'vocabulary_'):
+        meta['vectorizer_params'] = {
+            'ngram_range': list(vectorizer.ngram_range),
+            'max_features': vectorizer.max_features,
+        }
+        meta['vocabulary'] = {term: int(index) for term, index in vectorizer.vocabulary_.items()}
+    else:
+        # Hashed features have no vocabulary; the IDF array covers every bucket
+        meta['vectorizer_params'] = {
+            'type': 'hashing',
+            'ngram_range': list(vectorizer.ngram_range),
+            'n_features': vectorizer.n_features,
+        }
+    
+    np.save(os.path.join(tmp_path, 'idf.npy'), vectorizer.idf_)
+    np.save(os.path.join(tmp_path, 'data.npy'), faq_vectors.data)
+    np.save(os.path.join(tmp_path, 'indices.npy'), faq_vectors.indices.astype(np.int32))
+    np.save(os.path.join(tmp_path, 'indptr.npy'), faq_vectors.indptr.astype(np.int32))
+    
+    FAQStore.from_faqs(matcher.faqs).save(tmp_path)
+    
+    embedding_index = getattr(matcher, '_embedding_index', None)
+    if embedding_index is not None:
+        from preprocess import EMBEDDING_MODEL
+        np.save(os.path.join(tmp_path, 'embeddings.npy'), np.asarray(embedding_index.embeddings))
+        meta['embedding_model'] = EMBEDDING_MODEL
+    if getattr(matcher, '_ivf_index', None) is not None:
+        matcher._ivf_index.save(tmp_path)
+    
+    # meta.json is written last and marks the artifact as complete
+    with open(os.path.join(tmp_path, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    
+    old_path = f"{path}.old-{os.getpid()}"
+    try:
+        if os.path.exists(path):
+            os.rename(path, old_path)
+            os.rename(tmp_path, path)
+            shutil.rmtree(old_path, ignore_errors=True)
+        else:
+            os.rename(tmp_path, path)
+    except OSError:
+        # Another process (e.g. a pre-forked worker reloading at the same
+        # time) swapped in its copy first; leave no directories behind
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        shutil.rmtree(old_path, ignore_errors=True)
+        raise
+
+def read_meta(path=DEFAULT_INDEX_PATH):
+    """
+    Read the metadata of a saved index.
+    
+    Args:
+        path (str): Index directory
+    
+    Returns:
+        dict: Index metadata, or None if there is no complete index at path
+    """
+    try:
+        with open(os.path.join(path, 'meta.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def load_index(path=DEFAULT_INDEX_PATH, source_hash=None):
+    """
+    Load a saved index, memory-mapping its arrays.
+    
+    Args:
+        path (str): Index directory
+        source_hash (str): Expected content hash; a different stored hash counts as stale
+    
+    Returns:
+        dict: Fitted state with 'faqs' (a memory-mapped FAQStore), 'vectorizer', 'faq_vectors',
+              'embeddings' and 'ivf' keys (the last two None unless saved by an embedding
+              matcher), or None if the index is missing, from another format version or stale
+    """
+    from scipy.sparse import csr_matrix
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    
+    meta = read_meta(path)
+    if meta is None or meta.get('version') != INDEX_FORMAT_VERSION:
+        return None
+    if source_hash is not None and meta.get('source_hash') != source_hash:
+        return None
+    
+    arrays = {
+        name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+        for name in MATRIX_ARRAYS + ('idf',)
+    }
+    
+    faqs = FAQStore.open(path)
+    
+    params = meta['vectorizer_params']
+    if params.get('type') == 'hashing':
+        from hashing_vectorizer import HashingTfidfVectorizer
+        vectorizer = HashingTfidfVectorizer(params['n_features'], params['ngram_range'], arrays['idf'])
+    else:
+        vectorizer = TfidfVectorizer(
+            lowercase=True,
+            stop_words='english',
+            ngram_range=tuple(params['ngram_range']),
+            max_features=params['max_features']
+        )
+        vectorizer.vocabulary_ = meta['vocabulary']
+        vectorizer.idf_ = np.asarray(arrays['idf'])
+    
+    faq_vectors = csr_matrix(
+        (arrays['data'], arrays['indices'], arrays['indptr']),
+        shape=tuple(meta['shape']),
+        copy=False
+    )
+    
+    # Embeddings computed with other word vectors than the current ones are not reused
+    embeddings = ivf = None
+    if meta.get('embedding_model') is not None:
+        from ivf_index import IVFIndex
+        from preprocess import EMBEDDING_MODEL
+        if meta['embedding_model'] == EMBEDDING_MODEL:
+            embeddings = np.load(os.path.join(path, 'embeddings.npy'), mmap_mode='r')
+            ivf = IVFIndex.open(path)
+    
+    return {
+        'faqs': faqs,
+        'vectorizer': vectorizer,
+        'faq_vectors': faq_vectors,
+        'embeddings': embeddings,
+        'ivf': ivf
+    }
+
+def build_index(path=DEFAULT_INDEX_PATH, source=None, workers=1, **options):
+    """
+    Build the index for faqs.py (or a FAQ source) and save it to disk.
+    
+    Args:
+        path (str): Index directory
+        source (FAQSource): Streaming FAQ source to index instead of faqs.py
+        workers (int): Processes preprocessing the FAQs; None uses every CPU
+        **options: FAQMatcher arguments, such as backend='embedding', engine='ivf'
+    
+    Returns:
+        FAQMatcher: The freshly fitted matcher
+    """
+    from matcher import FAQMatcher
+    from preprocess import PreprocessPool, preprocess_faqs
+    
+    start = time.perf_counter()
+    if source is not None:
+        source_hash = source.content_hash()
+        with PreprocessPool(workers) as pool:
+            # Streamed into the matcher's FAQ store without a list of every FAQ
+            matcher = FAQMatcher(source.preprocessed(pool.workers * pool.chunk_size, pool), **options)
+    else:
+        faqs, source_hash = read_faqs_source()
+        matcher = FAQMatcher(preprocess_faqs(faqs, workers=workers), **options)
+    fit_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    save_index(matcher, path, source_hash)
+    save_time = time.perf_counter() - start
+    
+    print(f"Indexed {len(matcher.faqs)} FAQs in {fit_time * 1000:.1f} ms")
+    print(f"Saved index to {path} in {save_time * 1000:.1f} ms")
+    return matcher
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the on-disk FAQ index")
+    parser.add_argument('--path', default=DEFAULT_INDEX_PATH, help='Index directory')
+    parser.add_argument('--source', help='JSONL, CSV or SQLite FAQ file (default: faqs.py)')
+    parser.add_argument('--workers', type=int, default=1, help='Preprocessing processes (0: CPU count)')
+    parser.add_argument('--engine', choices=['brute', 'ivf'], default='brute',
+                        help='ivf also saves embeddings and IVF lists for the embedding backend')
+    parser.add_argument('--nlist', type=int, help='IVF lists (default: about sqrt(FAQs))')
+    parser.add_argument('--hashing', type=int, metavar='BUCKETS', nargs='?', const=0,
+                        help='Hash features into BUCKETS buckets instead of building a vocabulary')
+    args = parser.parse_args()
+    
+    source = None
+    if args.source:
+        from faq_sources import open_source
+        source = open_source(args.source)
+    options = {}
+    if args.engine == 'ivf':
+        options = {'backend': 'embedding', 'engine': 'ivf', 'ivf_nlist': args.nlist}
+    elif args.hashing is not None:
+        options = {'backend': 'hashing', 'hashing_buckets': args.hashing or None}
+    build_index(args.path, source, args.workers or None, **options)
+    
+    start = time.perf_counter()
+    from matcher import FAQMatcher
+    FAQMatcher.load(args.path, source=source, **options)
+    print(f"Loaded index in {(time.perf_counter() - start) * 1000:.1f} ms")
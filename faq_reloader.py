@@ -0,0 +1,136 @@
+"""
+FAQ Hot Reload
+Keeps the serving matcher behind a holder whose index can be replaced while
+the server is running. A new matcher is built on a background thread and
+swapped in with a single reference assignment: requests that already picked
+up the old matcher finish on it, and every later request sees the new one.
+
+Reloads are started explicitly with reload() (e.g. from an admin endpoint)
+or by a thread watching the FAQ source file for changes.
+"""
+
+import os
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+# A loaded matcher together with the version of the FAQ source it was built from
+LoadedIndex = namedtuple('LoadedIndex', ['matcher', 'version', 'loaded_at'])
+
+def file_signature(path):
+    """Return (modification time, size) of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class MatcherHolder:
+    """Holds the current matcher and swaps in rebuilt ones atomically."""
+    
+    def __init__(self, load):
+        """
+        Load the initial matcher.
+        
+        Args:
+            load (callable): Returns (matcher, version) for the current FAQ source
+        """
+        self._load = load
+        self._reload_lock = threading.Lock()
+        self._watcher_pid = None
+        self.reloading = False
+        self.reloads = 0
+        self.last_error = None
+        self.current = self._build()
+    
+    @property
+    def matcher(self):
+        """The matcher new requests should use."""
+        return self.current.matcher
+    
+    def _build(self):
+        matcher, version = self._load()
+        return LoadedIndex(matcher, version, datetime.now())
+    
+    def reload(self, wait=False):
+        """
+        Build a new matcher in the background and swap it in when it is ready.
+        
+        If building fails the current matcher stays in place and the error is
+        kept in last_error.
+        
+        Args:
+            wait (bool): Block until the reload has finished
+        
+        Returns:
+            bool: False if a reload was already running
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        
+        self.reloading = True
+        thread = threading.Thread(target=self._reload, name='faq-reload', daemon=True)
+        thread.start()
+        if wait:
+            thread.join()
+        return True
+    
+    def _reload(self):
+        try:
+            loaded = self._build()
+            # Load the preprocessing resources before any request waits on them
+            loaded.matcher.preprocessor.warm_up()
+            self.current = loaded
+            self.reloads += 1
+            self.last_error = None
+        except Exception as e:
+            self.last_error = f'{type(e).__name__}: {e}'
+        finally:
+            self.reloading = False
+            self._reload_lock.release()
+    
+    def watch(self, path, interval=2.0):
+        """
+        Reload whenever the file at path changes.
+        
+        Threads do not survive fork(), so this starts at most one watcher per
+        process and forked workers call it again to get their own.
+        
+        Args:
+            path (str): File to watch, such as faqs.py
+            interval (float): Seconds between checks
+        """
+        if self._watcher_pid == os.getpid():
+            return
+        self._watcher_pid = os.getpid()
+        
+        thread = threading.Thread(target=self._watch, args=(path, interval), name='faq-watcher', daemon=True)
+        thread.start()
+    
+    def _watch(self, path, interval):
+        last_signature = file_signature(path)
+        while True:
+            time.sleep(interval)
+            signature = file_signature(path)
+            # A change seen while another reload runs is picked up on a later check
+            if signature != last_signature and signature is not None and self.reload(wait=True):
+                last_signature = signature
+    
+    def status(self):
+        """
+        Describe the current index and reload state.
+        
+        Returns:
+            dict: JSON-serializable status
+        """
+        current = self.current
+        return {
+            'index_version': current.version,
+            'generation': current.matcher.generation,
+            'faqs': len(current.matcher.faqs),
+            'loaded_at': current.loaded_at.isoformat(timespec='seconds'),
+            'reloading': self.reloading,
+            'reloads': self.reloads,
+            'last_error': self.last_error
+        }
@@ -0,0 +1,190 @@
+"""
+External FAQ Sources
+Streaming loaders that read a knowledge base from a JSONL, CSV or SQLite file
+instead of the hard-coded list in faqs.py. Sources are read lazily and
+preprocessed in chunks, so building an index from a large help-center export
+only holds the FAQs themselves plus one chunk of raw rows in memory.
+
+    from faq_sources import open_source
+    from matcher import FAQMatcher
+    
+    matcher = FAQMatcher(source=open_source('help_center.jsonl'))
+"""
+
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+from itertools import islice
+
+from preprocess import preprocess_faqs
+
+# FAQs preprocessed per chunk while a source is being loaded
+DEFAULT_CHUNK_SIZE = 1000
+
+def chunked(iterable, size):
+    """Yield lists of up to size items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+class FAQSource:
+    """
+    Base class of file-backed FAQ sources.
+    
+    Subclasses implement iter_rows(); iterating a source yields FAQ
+    dictionaries with 'question' and 'answer' keys, skipping rows without
+    a question.
+    """
+    
+    def __init__(self, path, question_field='question', answer_field='answer'):
+        """
+        Initialize the source.
+        
+        Args:
+            path (str): File to read
+            question_field (str): Field/column holding the question
+            answer_field (str): Field/column holding the answer
+        """
+        self.path = path
+        self.question_field = question_field
+        self.answer_field = answer_field
+    
+    def iter_rows(self):
+        """Yield (question, answer) pairs as stored in the file."""
+        raise NotImplementedError
+    
+    def __iter__(self):
+        for question, answer in self.iter_rows():
+            question = str(question or '').strip()
+            if question:
+                yield {'question': question, 'answer': str(answer or '')}
+    
+    def preprocessed(self, chunk_size=DEFAULT_CHUNK_SIZE, preprocessor=None):
+        """
+        Stream the FAQs with their processed questions.
+        
+        Args:
+            chunk_size (int): FAQs read and preprocessed at a time
+            preprocessor (Preprocessor): Pipeline to use, defaults to the shared one
+        
+        Yields:
+            dict: FAQ dictionary with 'processed_question' field
+        """
+        for chunk in chunked(self, chunk_size):
+            yield from preprocess_faqs(chunk, preprocessor)
+    
+    def content_hash(self):
+        """
+        Compute a hash identifying the source file and how it is read.
+        
+        Used as the source hash of saved indexes, so a changed file or field
+        mapping rebuilds the index.
+        
+        Returns:
+            str: Hex SHA-256 digest
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps([type(self).__name__, self.describe()]).encode('utf-8'))
+        with open(self.path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def describe(self):
+        """Settings that change what is read from the file."""
+        return [self.question_field, self.answer_field]
+
+class JSONLSource(FAQSource):
+    """FAQs stored as one JSON object per line."""
+    
+    def iter_rows(self):
+        with open(self.path, encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    raise ValueError(f"{self.path}:{line_number}: invalid JSON") from None
+                if isinstance(item, dict):
+                    yield item.get(self.question_field), item.get(self.answer_field)
+
+class CSVSource(FAQSource):
+    """FAQs stored as CSV rows with a header line."""
+    
+    def iter_rows(self):
+        with open(self.path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                yield row.get(self.question_field), row.get(self.answer_field)
+
+class SQLiteSource(FAQSource):
+    """FAQs stored in a table of a SQLite database."""
+    
+    def __init__(self, path, question_field='question', answer_field='answer', table='faqs',
+                 query=None, fetch_size=DEFAULT_CHUNK_SIZE):
+        """
+        Initialize the source.
+        
+        Args:
+            path (str): SQLite database file
+            question_field (str): Column holding the question
+            answer_field (str): Column holding the answer
+            table (str): Table to read
+            query (str): Custom query returning (question, answer) rows; overrides the columns and table
+            fetch_size (int): Rows fetched from the cursor at a time
+        """
+        super().__init__(path, question_field, answer_field)
+        self.table = table
+        self.query = query
+        self.fetch_size = fetch_size
+    
+    def iter_rows(self):
+        query = self.query or 'SELECT {}, {} FROM {}'.format(
+            *(f'"{name}"' for name in (self.question_field, self.answer_field, self.table))
+        )
+        # Opened read-only, so loading can never modify the knowledge base
+        connection = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True)
+        try:
+            cursor = connection.execute(query)
+            while True:
+                rows = cursor.fetchmany(self.fetch_size)
+                if not rows:
+                    return
+                for question, answer in rows:
+                    yield question, answer
+        finally:
+            connection.close()
+    
+    def describe(self):
+        return super().describe() + [self.table, self.query]
+
+# Source class per file extension, used by open_source()
+SOURCE_TYPES = {
+    '.jsonl': JSONLSource,
+    '.ndjson': JSONLSource,
+    '.csv': CSVSource,
+    '.db': SQLiteSource,
+    '.sqlite': SQLiteSource,
+    '.sqlite3': SQLiteSource
+}
+
+def open_source(path, **options):
+    """
+    Create the source for a file based on its extension.
+    
+    Args:
+        path (str): JSONL, CSV or SQLite file
+        **options: Source arguments, such as question_field or table
+    
+    Returns:
+        FAQSource: Source reading the file
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SOURCE_TYPES:
+        raise ValueError(f"Unsupported FAQ source '{path}', expected one of {sorted(SOURCE_TYPES)}")
+    return SOURCE_TYPES[extension](path, **options)
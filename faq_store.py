@@ -0,0 +1,250 @@
+"""
+Columnar FAQ Store
+Keeps the FAQ texts column by column instead of as one dict per FAQ: every
+column (question, answer, processed question) is a single UTF-8 buffer plus
+an array of row offsets into it. Text is only decoded when a row is read, and
+match results reference their FAQ by row index instead of copying it.
+
+A saved store is opened memory-mapped: the buffers stay in the page cache,
+shared by every process, and reading a result only touches its own pages.
+"""
+
+import mmap
+import os
+from array import array
+
+import numpy as np
+
+# Text columns of every FAQ
+COLUMNS = ('question', 'answer', 'processed_question')
+
+# Per-match fields of a MatchResult, next to the FAQ columns
+MATCH_FIELDS = ('similarity_score', 'user_question', 'processed_user_question')
+
+def map_file(path):
+    """
+    Memory-map a file read-only.
+    
+    Returns:
+        memoryview: View of the file contents; slicing it does not copy
+    """
+    with open(path, 'rb') as f:
+        # Empty files cannot be mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b'')
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+class FAQStore:
+    """
+    Immutable columnar storage of FAQ texts.
+    
+    Rows read as FAQ dictionaries (store[i], iteration), so code written for
+    the list of FAQ dicts keeps working. Updates return a new store and leave
+    the old one untouched for readers still using it.
+    """
+    
+    def __init__(self, buffers, offsets):
+        """
+        Initialize the store from its column data.
+        
+        Args:
+            buffers (dict): Column name -> UTF-8 bytes of all values, concatenated
+                            (bytes or a memoryview of a mapped file)
+            offsets (dict): Column name -> int64 array of len(store) + 1 byte offsets
+        """
+        self._buffers = buffers
+        self._offsets = offsets
+        self._size = len(offsets[COLUMNS[0]]) - 1
+    
+    @classmethod
+    def from_faqs(cls, faqs):
+        """
+        Build a store from FAQ dictionaries.
+        
+        Args:
+            faqs (iterable): FAQ dictionaries with 'question', 'answer' and
+                             'processed_question'; read once, so a generator
+                             is never held in memory as a whole
+        
+        Returns:
+            FAQStore: The new store (faqs itself if it already is one)
+        """
+        if isinstance(faqs, FAQStore):
+            return faqs
+        
+        buffers = {column: bytearray() for column in COLUMNS}
+        offsets = {column: array('q', [0]) for column in COLUMNS}
+        for faq in faqs:
+            for column in COLUMNS:
+                buffer = buffers[column]
+                buffer += faq[column].encode('utf-8')
+                offsets[column].append(len(buffer))
+        
+        return cls(
+            {column: bytes(buffers[column]) for column in COLUMNS},
+            {column: np.frombuffer(offsets[column], dtype=np.int64) for column in COLUMNS}
+        )
+    
+    @classmethod
+    def open(cls, path):
+        """
+        Open a store saved with save(), memory-mapping its files.
+        
+        Args:
+            path (str): Directory holding the store files
+        
+        Returns:
+            FAQStore: Read-only store backed by the files
+        """
+        buffers = {}
+        offsets = {}
+        for column in COLUMNS:
+            buffers[column] = map_file(os.path.join(path, f'{column}.bin'))
+            offsets[column] = np.load(os.path.join(path, f'{column}.offsets.npy'), mmap_mode='r')
+        return cls(buffers, offsets)
+    
+    def save(self, path):
+        """
+        Write the store to a directory: one .bin text buffer and one
+        .offsets.npy offset table per column.
+        
+        Args:
+            path (str): Existing directory
+        """
+        for column in COLUMNS:
+            with open(os.path.join(path, f'{column}.bin'), 'wb') as f:
+                f.write(self._buffers[column])
+            np.save(os.path.join(path, f'{column}.offsets.npy'), np.asarray(self._offsets[column]))
+    
+    def __len__(self):
+        return self._size
+    
+    def __getitem__(self, index):
+        index = self._check_index(index)
+        return {column: self.text(column, index) for column in COLUMNS}
+    
+    def __iter__(self):
+        for index in range(self._size):
+            yield self[index]
+    
+    def _check_index(self, index):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('FAQ index out of range')
+        return index
+    
+    def text(self, column, index):
+        """
+        Decode one value.
+        
+        Args:
+            column (str): Column name, one of COLUMNS
+            index (int): Row index
+        
+        Returns:
+            str: The stored text
+        """
+        offsets = self._offsets[column]
+        return str(self._buffers[column][offsets[index]:offsets[index + 1]], 'utf-8')
+    
+    def column(self, column):
+        """
+        Decode a whole column.
+        
+        Returns:
+            list: One string per FAQ
+        """
+        buffer = self._buffers[column]
+        bounds = self._offsets[column].tolist()
+        return [str(buffer[start:end], 'utf-8') for start, end in zip(bounds, bounds[1:])]
+    
+    @property
+    def nbytes(self):
+        """Memory held by the column buffers and offset arrays, in bytes."""
+        return sum(len(self._buffers[column]) + self._offsets[column].nbytes for column in COLUMNS)
+    
+    def append(self, faq):
+        """Return a new store with a FAQ dictionary added at the end."""
+        return self._splice(self._size, self._size, [faq])
+    
+    def replace(self, index, faq):
+        """Return a new store with the FAQ at index replaced."""
+        index = self._check_index(index)
+        return self._splice(index, index + 1, [faq])
+    
+    def delete(self, index):
+        """Return a new store without the FAQ at index."""
+        index = self._check_index(index)
+        return self._splice(index, index + 1, [])
+    
+    def _splice(self, start, stop, faqs):
+        """Return a new store with rows start..stop replaced by faqs."""
+        buffers = {}
+        offsets = {}
+        for column in COLUMNS:
+            buffer, bounds = self._buffers[column], self._offsets[column]
+            encoded = [faq[column].encode('utf-8') for faq in faqs]
+            head, tail = int(bounds[start]), int(bounds[stop])
+            
+            buffers[column] = b''.join([buffer[:head]] + encoded + [buffer[tail:]])
+            new_bounds = head + np.cumsum([len(value) for value in encoded], dtype=np.int64)
+            shift = (new_bounds[-1] if len(new_bounds) else head) - tail
+            offsets[column] = np.concatenate([bounds[:start + 1], new_bounds, bounds[stop + 1:] + shift])
+        return FAQStore(buffers, offsets)
+
+class MatchResult:
+    """
+    A matched FAQ, referencing its row in an FAQStore.
+    
+    Supports the dict-style access of the FAQ dictionaries it replaces
+    (result['answer'], result.get('question'), dict(result)); FAQ text is
+    decoded from the store only when it is read.
+    """
+    
+    __slots__ = ('store', 'index', 'similarity_score', 'user_question', 'processed_user_question')
+    
+    def __init__(self, store, index, similarity_score, user_question, processed_user_question):
+        self.store = store
+        self.index = index
+        self.similarity_score = similarity_score
+        self.user_question = user_question
+        self.processed_user_question = processed_user_question
+    
+    @property
+    def question(self):
+        return self.store.text('question', self.index)
+    
+    @property
+    def answer(self):
+        return self.store.text('answer', self.index)
+    
+    @property
+    def processed_question(self):
+        return self.store.text('processed_question', self.index)
+    
+    def __getitem__(self, key):
+        if key in COLUMNS:
+            return self.store.text(key, self.index)
+        if key in MATCH_FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def __contains__(self, key):
+        return key in COLUMNS or key in MATCH_FIELDS
+    
+    def keys(self):
+        return COLUMNS + MATCH_FIELDS
+    
+    def to_dict(self):
+        """Materialize the result as a plain dictionary."""
+        return {key: self[key] for key in self.keys()}
+    
+    def __repr__(self):
+        return f"MatchResult(index={self.index}, similarity_score={self.similarity_score:.3f}, question={self.question!r})"
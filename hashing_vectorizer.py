@@ -0,0 +1,97 @@
+"""
+Hashed TF-IDF Vectorizer
+Feature-hashing replacement for the vocabulary-based TfidfVectorizer of
+FAQMatcher. Unigrams and bigrams are hashed into a fixed number of buckets,
+so there is no vocabulary to build, store or ship, no max_features cap that
+silently drops terms, and the memory of the vectorizer (one IDF weight per
+bucket) does not grow with the corpus.
+"""
+
+import numpy as np
+
+# Default number of hash buckets; collisions stay rare for FAQ-sized vocabularies
+DEFAULT_BUCKETS = 2 ** 18
+
+def smoothed_idf(document_frequency, n_documents):
+    """
+    Compute IDF weights the way TfidfVectorizer does (smooth_idf=True).
+    
+    Features no document contains get a weight of zero, so query terms the
+    FAQs never use do not count towards the query's norm.
+    
+    Args:
+        document_frequency (numpy.ndarray): Number of documents per feature
+        n_documents (int): Number of documents
+    
+    Returns:
+        numpy.ndarray: IDF weight per feature
+    """
+    return np.where(document_frequency > 0, np.log((1 + n_documents) / (1 + document_frequency)) + 1, 0.0)
+
+class HashingTfidfVectorizer:
+    """TF-IDF over hashed unigram and bigram features, L2-normalized."""
+    
+    def __init__(self, n_features=DEFAULT_BUCKETS, ngram_range=(1, 2), idf=None):
+        """
+        Initialize the vectorizer.
+        
+        Args:
+            n_features (int): Number of hash buckets
+            ngram_range (tuple): Smallest and largest n-gram length
+            idf (numpy.ndarray): Precomputed IDF weight per bucket, e.g. from a saved index
+        """
+        # scikit-learn is imported here so that importing this module stays cheap
+        from sklearn.feature_extraction.text import HashingVectorizer
+        
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.idf_ = idf
+        # Same tokenization and stop words as the vocabulary-based vectorizer;
+        # raw non-negative counts, weighted and normalized in transform()
+        self._hasher = HashingVectorizer(
+            n_features=n_features,
+            lowercase=True,
+            stop_words='english',
+            ngram_range=self.ngram_range,
+            alternate_sign=False,
+            norm=None
+        )
+    
+    def count(self, texts):
+        """
+        Count the hashed terms of texts.
+        
+        Returns:
+            scipy.sparse.csr_matrix: len(texts) x n_features term counts
+        """
+        return self._hasher.transform(texts)
+    
+    def fit_transform(self, texts):
+        """
+        Compute the IDF weights of texts and return their TF-IDF vectors.
+        
+        Returns:
+            scipy.sparse.csr_matrix: L2-normalized TF-IDF vectors
+        """
+        counts = self.count(texts)
+        document_frequency = np.bincount(counts.indices, minlength=self.n_features)
+        self.idf_ = smoothed_idf(document_frequency, counts.shape[0])
+        return self.weigh(counts)
+    
+    def transform(self, texts):
+        """
+        Vectorize texts with the fitted IDF weights.
+        
+        Returns:
+            scipy.sparse.csr_matrix: L2-normalized TF-IDF vectors
+        """
+        return self.weigh(self.count(texts))
+    
+    def weigh(self, counts):
+        """Apply the IDF weights to term counts and L2-normalize the rows."""
+        from sklearn.preprocessing import normalize
+        
+        weighted = counts.astype(np.float64)
+        weighted.data *= self.idf_[weighted.indices]
+        weighted.eliminate_zeros()
+        return normalize(weighted).tocsr()
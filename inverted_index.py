@@ -0,0 +1,129 @@
+"""
+Inverted-index scoring engine for FAQMatcher.
+
+Instead of scoring every FAQ, the engine keeps a term -> posting list index
+over the L2-normalized FAQ vectors and accumulates scores only for FAQs that
+share terms with the question. Top-k retrieval uses MaxScore-style early
+termination: terms are visited in order of their maximum possible
+contribution, and once the k-th best partial score beats everything the
+remaining terms could still add, no new FAQs are admitted and only the
+existing candidates are updated.
+"""
+
+import numpy as np
+from matcher import top_k_indices
+
+# Safety margin for pruning decisions made on floating-point partial sums
+PRUNE_EPSILON = 1e-9
+
+class InvertedIndex:
+    """Term -> posting list index with MaxScore top-k retrieval."""
+    
+    def __init__(self, faq_vectors):
+        """
+        Build the index.
+        
+        Args:
+            faq_vectors (scipy.sparse.csr_matrix): L2-normalized FAQ vectors, one row per FAQ
+        """
+        self.faq_vectors = faq_vectors
+        self.n_docs = faq_vectors.shape[0]
+        
+        # Column j of the CSC matrix is the posting list of term j, sorted by FAQ index
+        postings = faq_vectors.tocsc()
+        postings.sort_indices()
+        self.indptr = postings.indptr
+        self.doc_ids = postings.indices
+        self.weights = postings.data
+        
+        # Highest weight of each term over all FAQs, the MaxScore upper bounds
+        self.max_weights = postings.max(axis=0).toarray().ravel()
+    
+    def posting(self, term):
+        """
+        Get the posting list of a term.
+        
+        Returns:
+            tuple: (FAQ indices, term weights) arrays sorted by FAQ index
+        """
+        start, end = self.indptr[term], self.indptr[term + 1]
+        return self.doc_ids[start:end], self.weights[start:end]
+    
+    def search(self, query_vector, top_k):
+        """
+        Find the top k FAQs for a query.
+        
+        Results are identical to scoring every FAQ and taking the top k
+        (ties broken by lower index); FAQs sharing no terms with the query
+        score 0 and are only returned to fill up k.
+        
+        Args:
+            query_vector (scipy.sparse.csr_matrix): 1 x n_features L2-normalized query
+            top_k (int): Number of FAQs to return
+        
+        Returns:
+            tuple: (indices, scores) arrays in descending score order
+        """
+        top_k = min(top_k, self.n_docs)
+        terms = query_vector.indices
+        query_weights = query_vector.data
+        
+        # Visit terms by decreasing upper bound on their score contribution
+        bounds = query_weights * self.max_weights[terms]
+        order = np.argsort(-bounds, kind='stable')
+        terms, query_weights, bounds = terms[order], query_weights[order], bounds[order]
+        
+        # remaining[i]: the most that terms after position i can still add
+        remaining = np.append(np.cumsum(bounds[::-1])[::-1][1:], 0.0)
+        
+        candidates = np.array([], dtype=self.doc_ids.dtype)
+        partial = np.array([], dtype=np.float64)
+        kth_score = 0.0
+        position = len(terms)
+        
+        # Essential terms: any FAQ in their postings may still enter the top k
+        for i, (term, weight) in enumerate(zip(terms, query_weights)):
+            docs, doc_weights = self.posting(term)
+            merged, inverse = np.unique(np.concatenate([candidates, docs]), return_inverse=True)
+            partial = np.bincount(inverse, weights=np.concatenate([partial, doc_weights * weight]),
+                                  minlength=len(merged))
+            candidates = merged
+            
+            if len(candidates) >= top_k > 0:
+                kth_score = np.partition(partial, len(partial) - top_k)[len(partial) - top_k]
+                if kth_score > remaining[i] + PRUNE_EPSILON:
+                    position = i + 1
+                    break
+        
+        # Non-essential terms: only update candidates that can still reach the top k
+        for i in range(position, len(terms)):
+            keep = partial + bounds[i] + remaining[i] >= kth_score - PRUNE_EPSILON
+            candidates, partial = candidates[keep], partial[keep]
+            
+            docs, doc_weights = self.posting(terms[i])
+            if len(docs) == 0 or len(candidates) == 0:
+                continue
+            found = np.minimum(np.searchsorted(docs, candidates), len(docs) - 1)
+            hit = docs[found] == candidates
+            partial[hit] += doc_weights[found[hit]] * query_weights[i]
+        
+        # Rescore the surviving candidates exactly like the brute-force path
+        scores = (self.faq_vectors[candidates] @ query_vector.T).toarray().ravel()
+        best = top_k_indices(scores, top_k)
+        indices, scores = candidates[best].astype(np.intp), scores[best]
+        
+        if len(indices) < top_k:
+            indices, scores = self._fill_zero_scores(indices, scores, top_k)
+        return indices, scores
+    
+    def _fill_zero_scores(self, indices, scores, top_k):
+        """Pad results with the lowest-indexed FAQs not matched, which score 0."""
+        matched = set(indices.tolist())
+        fill = []
+        doc = 0
+        while len(fill) < top_k - len(indices):
+            if doc not in matched:
+                fill.append(doc)
+            doc += 1
+        return (np.concatenate([indices, np.array(fill, dtype=np.intp)]),
+                np.concatenate([scores, np.zeros(len(fill))]))
@@ -0,0 +1,202 @@
+"""
+Inverted-file (IVF) approximate nearest neighbour engine for the embedding backend.
+
+FAQ embeddings are clustered with spherical k-means into nlist lists, and the
+rows of every list are stored contiguously. A query is scored against the
+list centroids first and then only against the rows of its nprobe closest
+lists, so the work per query is about nprobe / nlist of a brute-force scan.
+Raising nprobe trades latency for recall; nprobe == nlist is exact search.
+"""
+
+import os
+
+import numpy as np
+from matcher import top_k_indices
+
+# Lists probed per query unless the matcher asks for another number
+DEFAULT_NPROBE = 8
+
+# k-means is trained on at most this many rows per list, sampled from the FAQs
+TRAINING_ROWS_PER_LIST = 64
+
+KMEANS_ITERATIONS = 10
+
+# Rows scored against the centroids at a time while assigning lists
+ASSIGN_BLOCK_ROWS = 16384
+
+# Array files of a saved index
+IVF_ARRAYS = ('centroids', 'ids', 'offsets', 'vectors')
+
+def default_nlist(n_rows):
+    """Number of lists for a corpus: about the square root of its size."""
+    return max(1, int(round(np.sqrt(n_rows))))
+
+def assign_lists(vectors, centroids):
+    """
+    Find the closest centroid of every row.
+    
+    Args:
+        vectors (numpy.ndarray): n x dimensions L2-normalized rows
+        centroids (numpy.ndarray): nlist x dimensions L2-normalized centroids
+    
+    Returns:
+        numpy.ndarray: List number per row
+    """
+    assignment = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), ASSIGN_BLOCK_ROWS):
+        block = np.asarray(vectors[start:start + ASSIGN_BLOCK_ROWS], dtype=np.float32)
+        assignment[start:start + ASSIGN_BLOCK_ROWS] = (block @ centroids.T).argmax(axis=1)
+    return assignment
+
+def train_centroids(vectors, nlist, iterations=KMEANS_ITERATIONS, seed=0):
+    """
+    Cluster rows with spherical k-means (cosine similarity, unit-length centroids).
+    
+    Args:
+        vectors (numpy.ndarray): n x dimensions L2-normalized rows, n >= nlist
+        nlist (int): Number of clusters
+        iterations (int): k-means iterations
+        seed (int): Random seed for sampling and initialization
+    
+    Returns:
+        numpy.ndarray: nlist x dimensions float32 centroids
+    """
+    from scipy.sparse import csr_matrix
+    
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), nlist * TRAINING_ROWS_PER_LIST)
+    sample = np.asarray(vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))], dtype=np.float32)
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+    
+    for _ in range(iterations):
+        assignment = assign_lists(sample, centroids)
+        # Sum the rows of every cluster with one sparse (clusters x rows) product
+        members = csr_matrix(
+            (np.ones(sample_size, dtype=np.float32), (assignment, np.arange(sample_size))),
+            shape=(nlist, sample_size)
+        )
+        sums = np.asarray(members @ sample)
+        norms = np.linalg.norm(sums, axis=1)
+        
+        # Empty clusters restart from random rows instead of collapsing
+        empty = np.flatnonzero(norms == 0)
+        sums[empty] = sample[rng.choice(sample_size, len(empty), replace=False)]
+        norms[empty] = 1
+        centroids = sums / norms[:, None]
+    return centroids.astype(np.float32)
+
+class IVFIndex:
+    """Embeddings grouped into k-means lists, searched by probing the closest lists."""
+    
+    def __init__(self, centroids, ids, offsets, vectors):
+        """
+        Initialize the index from its arrays; use build() or open() to create one.
+        
+        Args:
+            centroids (numpy.ndarray): nlist x dimensions float32 list centroids
+            ids (numpy.ndarray): FAQ index of every stored row
+            offsets (numpy.ndarray): nlist + 1 row offsets; list i is rows offsets[i]:offsets[i + 1]
+            vectors (numpy.ndarray): Embeddings in list order (float32 or float16)
+        """
+        self.centroids = centroids
+        self.ids = ids
+        self.offsets = offsets
+        self.vectors = vectors
+        self.sizes = np.diff(offsets)
+    
+    @classmethod
+    def build(cls, embeddings, nlist=None, seed=0, centroids=None):
+        """
+        Cluster FAQ embeddings into lists.
+        
+        Args:
+            embeddings (numpy.ndarray): n_faqs x dimensions L2-normalized embeddings
+            nlist (int): Number of lists, defaults to default_nlist(n_faqs);
+                         capped at the number of FAQs
+            seed (int): Random seed of the k-means training
+            centroids (numpy.ndarray): Centroids of an earlier build to assign the rows to
+                                       instead of training new ones (nlist is then ignored)
+        
+        Returns:
+            IVFIndex: The new index
+        """
+        n_rows = len(embeddings)
+        nlist = max(1, min(nlist or default_nlist(n_rows), n_rows))
+        if centroids is None and n_rows == 0:
+            centroids = np.zeros((1, embeddings.shape[1]), dtype=np.float32)
+        elif centroids is None:
+            centroids = train_centroids(embeddings, nlist, seed=seed)
+        assignment = assign_lists(embeddings, centroids)
+        
+        # Stable sort keeps FAQs in index order within each list
+        ids = np.argsort(assignment, kind='stable')
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=len(centroids)))])
+        vectors = np.ascontiguousarray(embeddings[ids])
+        return cls(centroids, ids.astype(np.int64), offsets.astype(np.int64), vectors)
+    
+    @classmethod
+    def open(cls, path):
+        """
+        Open an index saved with save(), memory-mapping its arrays.
+        
+        Args:
+            path (str): Directory holding the index files
+        
+        Returns:
+            IVFIndex: Read-only index backed by the files, or None if there is none at path
+        """
+        files = [os.path.join(path, f'ivf_{name}.npy') for name in IVF_ARRAYS]
+        if not all(os.path.exists(file) for file in files):
+            return None
+        return cls(*(np.load(file, mmap_mode='r') for file in files))
+    
+    def save(self, path):
+        """
+        Write the index arrays to a directory as ivf_<name>.npy files.
+        
+        Args:
+            path (str): Existing directory
+        """
+        for name in IVF_ARRAYS:
+            np.save(os.path.join(path, f'ivf_{name}.npy'), np.asarray(getattr(self, name)))
+    
+    @property
+    def nlist(self):
+        """Number of lists."""
+        return len(self.centroids)
+    
+    def search(self, query_embedding, top_k, nprobe=DEFAULT_NPROBE):
+        """
+        Find the approximate top k FAQs for a query.
+        
+        Probes the nprobe lists with the closest centroids, and more lists
+        if those hold fewer than top_k FAQs.
+        
+        Args:
+            query_embedding (numpy.ndarray): L2-normalized embedding of the query
+            top_k (int): Number of FAQs to return
+            nprobe (int): Lists to probe
+        
+        Returns:
+            tuple: (indices, scores) arrays in descending score order
+        """
+        query = np.asarray(query_embedding, dtype=np.float32).ravel()
+        top_k = min(top_k, len(self.ids))
+        
+        order = np.argsort(-(self.centroids @ query), kind='stable')
+        probes = max(min(nprobe, self.nlist), int(np.searchsorted(np.cumsum(self.sizes[order]), top_k)) + 1)
+        
+        positions = []
+        scores = []
+        for list_number in order[:probes]:
+            start, end = self.offsets[list_number], self.offsets[list_number + 1]
+            if start < end:
+                positions.append(np.arange(start, end))
+                scores.append(np.asarray(self.vectors[start:end], dtype=np.float32) @ query)
+        if not positions:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+        
+        positions = np.concatenate(positions)
+        scores = np.concatenate(scores)
+        best = top_k_indices(scores, top_k)
+        return np.asarray(self.ids[positions[best]]), scores[best]
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Load Test
+Sends concurrent /ask requests to a running chatbot server and reports
+throughput and latency percentiles, plus how many requests were rejected
+with 429 by the server's backpressure.
+
+Usage:
+    python load_test.py [--url http://localhost:8000] [--concurrency 32] [--requests 2000]
+"""
+
+import argparse
+import http.client
+import json
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from faqs import faqs
+
+_local = threading.local()
+
+def percentile(sorted_values, fraction):
+    """Return the value at the given fraction (0-1) of a sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def send_question(url, question):
+    """
+    Send one /ask request over this thread's keep-alive connection.
+    
+    Returns:
+        tuple: (HTTP status, latency in seconds)
+    """
+    if getattr(_local, 'connection', None) is None:
+        _local.connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+    
+    body = json.dumps({'question': question})
+    start = time.perf_counter()
+    try:
+        _local.connection.request('POST', '/ask', body, {'Content-Type': 'application/json'})
+        response = _local.connection.getresponse()
+        response.read()
+        status = response.status
+    except (OSError, http.client.HTTPException):
+        _local.connection.close()
+        _local.connection = None
+        status = 'error'
+    return status, time.perf_counter() - start
+
+def load_test(base_url, concurrency, total_requests, seed=0):
+    """Run the load test and print the report."""
+    url = urlparse(base_url)
+    rng = random.Random(seed)
+    questions = [rng.choice(faqs)['question'] for _ in range(total_requests)]
+    
+    print("📈 Chatbot Load Test")
+    print("=" * 50)
+    print(f"Target: {base_url}  Concurrency: {concurrency}  Requests: {total_requests}")
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda question: send_question(url, question), questions))
+    elapsed = time.perf_counter() - start
+    
+    statuses = Counter(status for status, _ in results)
+    latencies = sorted(latency for status, latency in results if status == 200)
+    
+    print("-" * 50)
+    print(f"Throughput:  {total_requests / elapsed:,.1f} requests/sec")
+    print(f"Statuses:    {dict(statuses)}")
+    print(f"Latency p50: {percentile(latencies, 0.50) * 1000:.1f} ms")
+    print(f"Latency p90: {percentile(latencies, 0.90) * 1000:.1f} ms")
+    print(f"Latency p99: {percentile(latencies, 0.99) * 1000:.1f} ms")
+    print(f"Latency max: {(latencies[-1] if latencies else 0) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test a running chatbot server")
+    parser.add_argument('--url', default='http://localhost:8000', help='Server base URL')
+    parser.add_argument('--concurrency', type=int, default=32, help='Concurrent clients')
+    parser.add_argument('--requests', type=int, default=2000, help='Total requests to send')
+    args = parser.parse_args()
+    
+    load_test(args.url, args.concurrency, args.requests)
@@ -1,22 +1,140 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import itertools
+import threading
+from collections import OrderedDict
 import numpy as np
-from preprocess import preprocess_text
+import metrics
+from faq_store import FAQStore, MatchResult
+from preprocess import default_preprocessor, preprocess_faqs, PreprocessPool
 from processed_faqs import get_processed_faqs
 
+# Scoring engines selectable per matcher
+ENGINES = ('brute', 'inverted', 'ivf')
+
+# Question representations: sparse TF-IDF vectors (over a vocabulary or hashed
+# features) or dense word-vector embeddings
+BACKENDS = ('tfidf', 'hashing', 'embedding')
+
+# Index generations are unique across matchers, so a shared cache never mixes them up
+_generations = itertools.count(1)
+
+# Share of vocabulary terms no FAQ uses any more before updates compact the index
+COMPACT_UNUSED_FRACTION = 0.25
+
+def top_k_indices(scores, top_k):
+    """
+    Get the indices of the top k scores, best first.
+    
+    Uses argpartition to find the k-th best score in linear time and only
+    sorts the k selected entries. Ties are broken by lower index, like
+    np.argmax, so the result does not depend on partition order.
+    
+    Args:
+        scores (numpy.ndarray): One score per FAQ
+        top_k (int): Number of indices to return
+        
+    Returns:
+        numpy.ndarray: Indices of the top k scores in descending score order
+    """
+    if top_k <= 0:
+        return np.array([], dtype=np.intp)
+    if top_k < len(scores):
+        kth_score = scores[np.argpartition(scores, -top_k)[-top_k]]
+        above = np.flatnonzero(scores > kth_score)
+        ties = np.flatnonzero(scores == kth_score)[:top_k - len(above)]
+        candidates = np.concatenate([above, ties])
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
 class FAQMatcher:
-    def __init__(self, faqs=None):
+    def __init__(self, faqs=None, preprocessor=None, index=None, engine='brute', cache=None, source=None,
+                 backend='tfidf', embedding_dtype='float32', ivf_nlist=None, ivf_nprobe=8,
+                 hashing_buckets=None):
         """
         Initialize the FAQ matcher with TF-IDF vectorization.
         
         Args:
-            faqs (list): List of FAQ dictionaries. If None, loads from processed_faqs
+            faqs (iterable): FAQ dictionaries (a list, a generator read once, or an FAQStore).
+                             If None, loads from processed_faqs
+            preprocessor (Preprocessor): Pipeline for user questions, defaults to the shared one
+            index (dict): Previously fitted state from faq_index.load_index; skips fitting
+            engine (str): Scoring engine, 'brute' scores every FAQ, 'inverted' only
+                          visits FAQs sharing terms with the question, 'ivf' (embedding
+                          backend only) only scores the closest k-means lists of FAQs
+            cache (QueryCache): Optional cache of search results per preprocessed question;
+                                it is cleared whenever the FAQ index is (re)built
+            source (FAQSource): Streaming FAQ source (see faq_sources) to load and
+                                preprocess chunk by chunk instead of faqs
+            backend (str): 'tfidf' scores TF-IDF vectors over a vocabulary of at most
+                           1000 terms, 'hashing' TF-IDF vectors over hashed features
+                           without a vocabulary (see hashing_vectorizer.py), 'embedding'
+                           dense word-vector embeddings (see embeddings.py), which also
+                           match paraphrases that share no words
+            embedding_dtype (str): Storage type of the embedding matrix, 'float32' or 'float16'
+            ivf_nlist (int): Number of lists of the 'ivf' engine, defaults to about sqrt(FAQs)
+            ivf_nprobe (int): Lists the 'ivf' engine scores per question; higher is slower
+                              but finds more of the exact top matches
+            hashing_buckets (int): Hash buckets of the 'hashing' backend, defaults to
+                                   hashing_vectorizer.DEFAULT_BUCKETS
         """
-        if faqs is None:
-            self.faqs = get_processed_faqs()
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}")
+        if backend == 'embedding' and engine == 'inverted':
+            raise ValueError("The inverted engine needs sparse vectors and cannot be used with the embedding backend")
+        if engine == 'ivf' and backend != 'embedding':
+            raise ValueError("The ivf engine searches dense embeddings and needs the embedding backend")
+        
+        self.preprocessor = preprocessor or default_preprocessor
+        self.engine = engine
+        self.backend = backend
+        self.embedding_dtype = embedding_dtype
+        self.ivf_nlist = ivf_nlist
+        self.ivf_nprobe = ivf_nprobe
+        self.hashing_buckets = hashing_buckets
+        self.cache = cache
+        
+        # Raw term counts for incremental updates, built on the first update
+        self._counts = None
+        # Counts of the terms a capped fit left out of the vocabulary, by term
+        self._excluded = {}
+        self._excluded_counts = None
+        
+        # Embeddings and IVF lists restored from a saved index, used by the first engine build
+        self._saved_embeddings = None
+        self._saved_ivf = None
+        
+        # FAQ texts are kept in a columnar store rather than one dict per FAQ
+        if index is not None:
+            self.faqs = FAQStore.from_faqs(index['faqs'])
+            self.vectorizer = index['vectorizer']
+            self.faq_vectors = index['faq_vectors']
+            self._saved_embeddings = index.get('embeddings')
+            self._saved_ivf = index.get('ivf')
         else:
-            self.faqs = faqs
-            
+            if source is not None:
+                self.faqs = FAQStore.from_faqs(source.preprocessed(preprocessor=self.preprocessor))
+            elif faqs is None:
+                self.faqs = FAQStore.from_faqs(get_processed_faqs())
+            else:
+                self.faqs = FAQStore.from_faqs(faqs)
+            self._fit()
+        
+        self._index_changed()
+    
+    def _fit(self):
+        """Fit the TF-IDF vectorizer and compute the FAQ vectors."""
+        # scikit-learn is imported here so that importing this module stays cheap
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.preprocessing import normalize
+        
+        if self.backend == 'hashing':
+            from hashing_vectorizer import DEFAULT_BUCKETS, HashingTfidfVectorizer
+            self.vectorizer = HashingTfidfVectorizer(self.hashing_buckets or DEFAULT_BUCKETS)
+            self.faq_vectors = self.vectorizer.fit_transform(self.faq_questions)
+            return
+        
         self.vectorizer = TfidfVectorizer(
             lowercase=True,
             stop_words='english',
@@ -24,12 +142,397 @@ class FAQMatcher:
             max_features=1000
         )
         
-        # Prepare FAQ questions for vectorization
-        self.faq_questions = [faq['processed_question'] for faq in self.faqs]
+        # Fit the vectorizer on FAQ questions and L2-normalize the rows once,
+        # so scoring a query is a plain sparse dot product
+        self.faq_vectors = normalize(self.vectorizer.fit_transform(self.faq_questions)).tocsr()
+    
+    @property
+    def faq_questions(self):
+        """Processed FAQ questions, decoded from the store on each access."""
+        return self.faqs.column('processed_question')
+    
+    def _index_changed(self):
+        """Rebuild derived structures after the FAQ vectors changed."""
+        self._build_engine()
+        self.generation = next(_generations)
+        if self.cache is not None:
+            self.cache.clear()
+    
+    def _build_engine(self):
+        """Build the data structures of the selected backend and scoring engine."""
+        if self.backend == 'embedding':
+            from embeddings import EmbeddingIndex
+            self._embedding_index = EmbeddingIndex(self.faq_questions, self.embedding_dtype,
+                                                   embeddings=self._saved_embeddings)
+        else:
+            self._embedding_index = None
+        
+        if self.engine == 'inverted':
+            from inverted_index import InvertedIndex
+            self._inverted_index = InvertedIndex(self.faq_vectors)
+        else:
+            self._inverted_index = None
+        
+        if self.engine == 'ivf':
+            from ivf_index import IVFIndex
+            ivf = self._saved_ivf
+            previous = getattr(self, '_ivf_index', None)
+            # Saved lists are only reused if they were built the way this matcher would
+            if (ivf is None or ivf.vectors.dtype != self._embedding_index.embeddings.dtype
+                    or (self.ivf_nlist and ivf.nlist != min(self.ivf_nlist, len(self.faqs)))):
+                # After FAQ updates the FAQs are reassigned to the trained centroids;
+                # a new matcher is needed to retrain them
+                ivf = IVFIndex.build(self._embedding_index.embeddings, self.ivf_nlist,
+                                     centroids=previous.centroids if previous is not None else None)
+            self._ivf_index = ivf
+        else:
+            self._ivf_index = None
+        
+        # Later rebuilds follow FAQ updates and must not reuse the saved state
+        self._saved_embeddings = None
+        self._saved_ivf = None
+    
+    @classmethod
+    def load(cls, path=None, faqs=None, preprocessor=None, source_hash=None, source=None, workers=1, **options):
+        """
+        Load a matcher from a saved on-disk index.
+        
+        If the index is missing, from an older format or was built from
+        different FAQs, the matcher is rebuilt and the index saved again.
+        
+        Args:
+            path (str): Index directory, defaults to faq_index.DEFAULT_INDEX_PATH
+            faqs (list): FAQ set the index must match. If None, the FAQs in faqs.py as it
+                         is on disk now
+            preprocessor (Preprocessor): Pipeline for user questions
+            source_hash (str): Content hash of the FAQ set, defaults to faqs_hash(faqs)
+            source (FAQSource): Streaming FAQ source to index instead of faqs
+            workers (int): Processes preprocessing faqs or source if the index is rebuilt;
+                           None uses every CPU
+            **options: Other FAQMatcher arguments, such as engine
+            
+        Returns:
+            FAQMatcher: Ready-to-use matcher
+        """
+        from faq_index import DEFAULT_INDEX_PATH, faqs_hash, load_index, read_faqs_source
+        
+        path = path or DEFAULT_INDEX_PATH
+        if source is None and faqs is None:
+            # Hash and (if rebuilding) fit the same read of faqs.py, not the
+            # module imported at start-up, which may predate edits
+            faqs, faqs_py_hash = read_faqs_source()
+            source_hash = source_hash or faqs_py_hash
+        if source_hash is None:
+            source_hash = source.content_hash() if source is not None else faqs_hash(faqs)
+        index = load_index(path, source_hash)
+        if index is not None and not cls._vectorizer_matches(index['vectorizer'], options):
+            index = None
+        
+        if index is not None:
+            matcher = cls(preprocessor=preprocessor, index=index, **options)
+            if matcher._has_saved_state(index):
+                return matcher
+            # Persist the embeddings or IVF lists built for this matcher, so
+            # the next worker loads them instead of rebuilding them
+            try:
+                matcher.save(path, source_hash)
+            except OSError:
+                pass
+            return matcher
+        
+        with PreprocessPool(workers, preprocessor=preprocessor) as pool:
+            if source is not None:
+                # Read enough rows at a time to give every worker full chunks;
+                # the matcher reads the generator into its store chunk by chunk
+                faqs = source.preprocessed(pool.workers * pool.chunk_size, pool)
+            elif faqs is not None:
+                faqs = preprocess_faqs(faqs, pool)
+            matcher = cls(faqs, preprocessor, **options)
+        try:
+            matcher.save(path, source_hash)
+        except OSError:
+            # Another process may be replacing the index at the same moment;
+            # the fitted matcher is usable either way
+            return matcher
+        
+        # Serve from the saved files, so the FAQ texts are memory-mapped
+        # instead of held in this process's memory
+        index = load_index(path, source_hash)
+        if index is None:
+            return matcher
+        return cls(preprocessor=preprocessor, index=index, **options)
+    
+    @staticmethod
+    def _vectorizer_matches(vectorizer, options):
+        """Check that a saved vectorizer is the kind the matcher options ask for."""
+        from hashing_vectorizer import DEFAULT_BUCKETS, HashingTfidfVectorizer
+        
+        if options.get('backend') != 'hashing':
+            return not isinstance(vectorizer, HashingTfidfVectorizer)
+        return (isinstance(vectorizer, HashingTfidfVectorizer)
+                and vectorizer.n_features == (options.get('hashing_buckets') or DEFAULT_BUCKETS))
+    
+    def _has_saved_state(self, index):
+        """Check that a loaded index held everything this matcher's backend and engine use."""
+        if self.backend == 'embedding' and index.get('embeddings') is None:
+            return False
+        return self.engine != 'ivf' or index.get('ivf') is not None
+    
+    def save(self, path=None, source_hash=None):
+        """
+        Save the fitted matcher to an on-disk index.
+        
+        Args:
+            path (str): Index directory, defaults to faq_index.DEFAULT_INDEX_PATH
+            source_hash (str): Content hash of the FAQ set, defaults to faqs_hash() of
+                               the matcher's own FAQs
+        """
+        from faq_index import DEFAULT_INDEX_PATH, faqs_hash, save_index
+        
+        save_index(self, path or DEFAULT_INDEX_PATH, source_hash or faqs_hash(self.faqs))
+        
+    def add_faq(self, question, answer):
+        """
+        Add a FAQ without refitting the matcher.
+        
+        Unseen terms are appended to the vocabulary and the IDF weights are
+        recomputed from stored document frequencies, so scores are the same as
+        after a full refit on the new FAQ set. Once the fit has cut the
+        vocabulary to the vectorizer's max_features, terms it left out are
+        still counted in every FAQ when they enter the vocabulary, but the
+        vocabulary is no longer cut back as a full refit would.
+        Updates are not synchronized with queries running on other threads.
         
-        # Fit the vectorizer on FAQ questions
-        self.faq_vectors = self.vectorizer.fit_transform(self.faq_questions)
+        Args:
+            question (str): FAQ question
+            answer (str): FAQ answer
+            
+        Returns:
+            int: Index of the new FAQ
+        """
+        from scipy.sparse import vstack
+        
+        self._ensure_counts()
+        faq = {'question': question, 'answer': answer,
+               'processed_question': self.preprocessor.process(question)}
+        row = self._count_terms(faq['processed_question'])
         
+        self._counts = vstack([self._counts, row], format='csr')
+        if self._excluded_counts is not None:
+            # All terms of the new FAQ are in the vocabulary now
+            self._excluded_counts.resize((self._counts.shape[0], self._excluded_counts.shape[1]))
+        self.faqs = self.faqs.append(faq)
+        self._update_index()
+        return len(self.faqs) - 1
+    
+    def update_faq(self, index, question=None, answer=None):
+        """
+        Change the question and/or answer of a FAQ without refitting the matcher.
+        
+        Args:
+            index (int): Index of the FAQ to change; negative values count from the end
+            question (str): New question, or None to keep it
+            answer (str): New answer, or None to keep it
+        
+        Raises:
+            IndexError: If index is out of range
+        """
+        from scipy.sparse import vstack
+        
+        # Normalize the index, as the row slicing below needs a non-negative one
+        index = range(len(self.faqs))[index]
+        faq = self.faqs[index]
+        if answer is not None:
+            faq['answer'] = answer
+        
+        reindex = question is not None and question != faq['question']
+        if reindex:
+            self._ensure_counts()
+            faq['question'] = question
+            faq['processed_question'] = self.preprocessor.process(question)
+            self._document_frequency[self._counts[index].indices] -= 1
+            if self._excluded_counts is not None:
+                # Forget the old question's left-out terms before any of them is counted
+                start, end = self._excluded_counts.indptr[index:index + 2]
+                self._excluded_counts.data[start:end] = 0
+                self._excluded_counts.eliminate_zeros()
+            row = self._count_terms(faq['processed_question'])
+            self._counts = vstack([self._counts[:index], row, self._counts[index + 1:]], format='csr')
+        
+        # Results are built from self.faqs on every call, so answer-only
+        # changes need no reindexing and keep the cache valid
+        self.faqs = self.faqs.replace(index, faq)
+        if reindex:
+            self._update_index()
+    
+    def remove_faq(self, index):
+        """
+        Remove a FAQ without refitting the matcher. Later FAQs move down one index.
+        
+        Args:
+            index (int): Index of the FAQ to remove; negative values count from the end
+            
+        Returns:
+            dict: The removed FAQ
+        
+        Raises:
+            IndexError: If index is out of range
+        """
+        index = range(len(self.faqs))[index]
+        self._ensure_counts()
+        faq = self.faqs[index]
+        
+        self._document_frequency[self._counts[index].indices] -= 1
+        keep = np.ones(self._counts.shape[0], dtype=bool)
+        keep[index] = False
+        self._counts = self._counts[keep]
+        if self._excluded_counts is not None:
+            self._excluded_counts = self._excluded_counts[keep]
+        self.faqs = self.faqs.delete(index)
+        self._update_index()
+        return faq
+    
+    def compact(self):
+        """
+        Drop vocabulary terms that no FAQ uses any more.
+        
+        Removed and updated FAQs leave such terms behind with an IDF weight of
+        zero. Updates call this automatically once they exceed
+        COMPACT_UNUSED_FRACTION of the vocabulary.
+        """
+        self._ensure_counts()
+        self._drop_unused_terms()
+        self._update_index()
+    
+    def _ensure_counts(self):
+        """Build the raw term counts and document frequencies of the current FAQs."""
+        if self._counts is not None:
+            return
+        if self.backend == 'hashing':
+            # Hashed features need no vocabulary: every bucket has a fixed column
+            self._counts = self.vectorizer.count(self.faq_questions).tocsr()
+            self._document_frequency = np.bincount(self._counts.indices, minlength=self.vectorizer.n_features)
+            return
+        from sklearn.feature_extraction.text import CountVectorizer
+        
+        # Same tokenization, stop words and n-grams as the fitted vectorizer
+        self._analyzer = self.vectorizer.build_analyzer()
+        self._vocabulary = dict(self.vectorizer.vocabulary_)
+        questions = self.faq_questions
+        counter = CountVectorizer(analyzer=self._analyzer, vocabulary=self._vocabulary)
+        self._counts = counter.transform(questions).tocsr()
+        self._document_frequency = np.bincount(self._counts.indices, minlength=len(self._vocabulary))
+        
+        max_features = self.vectorizer.max_features
+        if max_features is not None and len(self._vocabulary) >= max_features:
+            # The fit kept only the most frequent terms. Count the others too, so
+            # one that a new FAQ brings into the vocabulary is counted in every FAQ
+            counter = CountVectorizer(analyzer=self._analyzer)
+            all_counts = counter.fit_transform(questions).tocsc()
+            excluded = [(column, term) for term, column in counter.vocabulary_.items()
+                        if term not in self._vocabulary]
+            self._excluded = {term: position for position, (_, term) in enumerate(excluded)}
+            self._excluded_counts = all_counts[:, [column for column, _ in excluded]].tocsr()
+    
+    def _count_terms(self, processed_question):
+        """
+        Count the terms of a question, adding unseen terms to the vocabulary.
+        
+        Returns:
+            scipy.sparse.csr_matrix: 1 x n_features row of term counts
+        """
+        from scipy.sparse import csr_matrix
+        
+        if self.backend == 'hashing':
+            row = self.vectorizer.count([processed_question]).tocsr()
+            self._document_frequency[row.indices] += 1
+            return row
+        
+        counts = {}
+        promoted = []
+        for term in self._analyzer(processed_question):
+            column = self._vocabulary.get(term)
+            if column is None:
+                column = self._vocabulary[term] = len(self._vocabulary)
+                if term in self._excluded:
+                    promoted.append((column, self._excluded.pop(term)))
+            counts[column] = counts.get(column, 0) + 1
+        
+        n_features = len(self._vocabulary)
+        if n_features > len(self._document_frequency):
+            self._document_frequency = np.concatenate([
+                self._document_frequency,
+                np.zeros(n_features - len(self._document_frequency), dtype=self._document_frequency.dtype)
+            ])
+        columns = np.array(sorted(counts), dtype=np.int64)
+        self._document_frequency[columns] += 1
+        
+        if self._counts.shape[1] < n_features:
+            self._counts.resize((self._counts.shape[0], n_features))
+        if promoted:
+            self._add_excluded_terms(promoted)
+        values = np.array([counts[column] for column in columns], dtype=self._counts.dtype)
+        return csr_matrix((values, columns, [0, len(columns)]), shape=(1, n_features))
+    
+    def _add_excluded_terms(self, promoted):
+        """
+        Add the counts in the existing FAQs of terms the fit left out of the vocabulary.
+        
+        Args:
+            promoted (list): (vocabulary column, position in the excluded counts) pairs
+        """
+        from scipy.sparse import csr_matrix
+        
+        columns = np.array([column for column, _ in promoted])
+        counts = self._excluded_counts[:, [position for _, position in promoted]].tocoo()
+        self._counts = (self._counts + csr_matrix(
+            (counts.data, (counts.row, columns[counts.col])), shape=self._counts.shape
+        )).tocsr()
+        self._document_frequency[columns] += np.bincount(counts.col, minlength=len(columns))
+    
+    def _drop_unused_terms(self):
+        """Remove vocabulary terms with a document frequency of zero."""
+        if self.backend == 'hashing':
+            # The hashed feature space has a fixed size and nothing to drop
+            return
+        used = self._document_frequency > 0
+        new_columns = np.cumsum(used) - 1
+        
+        self._vocabulary = {term: int(new_columns[column])
+                            for term, column in self._vocabulary.items() if used[column]}
+        self._counts = self._counts[:, np.flatnonzero(used)].tocsr()
+        self._document_frequency = self._document_frequency[used]
+    
+    def _update_index(self):
+        """Recompute IDF weights and FAQ vectors from the term counts."""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.preprocessing import normalize
+        from hashing_vectorizer import HashingTfidfVectorizer, smoothed_idf
+        
+        unused = np.count_nonzero(self._document_frequency == 0)
+        if unused > COMPACT_UNUSED_FRACTION * len(self._document_frequency):
+            self._drop_unused_terms()
+        
+        # Smoothed IDF as computed by TfidfVectorizer. Unused terms get a weight
+        # of zero so queries are normalized as if they were not in the vocabulary
+        idf = smoothed_idf(self._document_frequency, self._counts.shape[0])
+        
+        if self.backend == 'hashing':
+            self.vectorizer = HashingTfidfVectorizer(self.vectorizer.n_features, self.vectorizer.ngram_range, idf)
+            self.faq_vectors = self.vectorizer.weigh(self._counts)
+            self._index_changed()
+            return
+        
+        # A fresh vectorizer, set up like faq_index.load_index does, so the
+        # vocabulary can grow beyond the size the original one was fitted with
+        vectorizer = TfidfVectorizer(**self.vectorizer.get_params())
+        vectorizer.vocabulary_ = dict(self._vocabulary)
+        vectorizer.idf_ = idf
+        
+        self.vectorizer = vectorizer
+        self.faq_vectors = normalize(self._counts.multiply(idf).tocsr())
+        self._index_changed()
+    
     def get_best_match(self, user_question, threshold=0.1):
         """
         Find the best matching FAQ for a user question.
@@ -39,34 +542,30 @@ class FAQMatcher:
             threshold (float): Minimum similarity threshold (0-1)
             
         Returns:
-            dict: Best matching FAQ with similarity score, or None if below threshold
+            MatchResult: Best matching FAQ with similarity score, or None if below threshold
         """
         if not user_question or not user_question.strip():
             return None
             
         # Preprocess user question
-        processed_question = preprocess_text(user_question)
+        started = metrics.start()
+        processed_question = self.preprocessor.process(user_question, timed=True)
+        metrics.lap('preprocess', started)
         
         if not processed_question:
             return None
             
-        # Vectorize user question
-        user_vector = self.vectorizer.transform([processed_question])
-        
-        # Calculate cosine similarity
-        similarities = cosine_similarity(user_vector, self.faq_vectors).flatten()
-        
-        # Find best match
-        best_index = np.argmax(similarities)
-        best_score = similarities[best_index]
+        # Vectorize user question and find the best match
+        best_indices, best_scores = self._search_question(processed_question, 1)
+        best_index = best_indices[0]
+        best_score = best_scores[0]
         
         # Check if similarity is above threshold
         if best_score >= threshold:
-            best_faq = self.faqs[best_index].copy()
-            best_faq['similarity_score'] = best_score
-            best_faq['user_question'] = user_question
-            best_faq['processed_user_question'] = processed_question
-            return best_faq
+            started = metrics.start()
+            result = self._build_result(best_index, best_score, user_question, processed_question)
+            metrics.lap('result', started)
+            return result
         else:
             return None
     
@@ -86,33 +585,158 @@ class FAQMatcher:
             return []
             
         # Preprocess user question
-        processed_question = preprocess_text(user_question)
+        started = metrics.start()
+        processed_question = self.preprocessor.process(user_question, timed=True)
+        metrics.lap('preprocess', started)
         
         if not processed_question:
             return []
             
-        # Vectorize user question
-        user_vector = self.vectorizer.transform([processed_question])
-        
-        # Calculate cosine similarity
-        similarities = cosine_similarity(user_vector, self.faq_vectors).flatten()
-        
-        # Get top k indices
-        top_indices = np.argsort(similarities)[::-1][:top_k]
+        # Vectorize user question and get top k indices
+        top_indices, top_scores = self._search_question(processed_question, top_k)
         
         # Filter by threshold and create results
+        started = metrics.start()
         matches = []
-        for idx in top_indices:
-            score = similarities[idx]
+        for idx, score in zip(top_indices, top_scores):
             if score >= threshold:
-                faq = self.faqs[idx].copy()
-                faq['similarity_score'] = score
-                faq['user_question'] = user_question
-                faq['processed_user_question'] = processed_question
-                matches.append(faq)
+                matches.append(self._build_result(idx, score, user_question, processed_question))
+        metrics.lap('result', started)
         
         return matches
     
+    def get_best_matches(self, user_questions, threshold=0.1, batch_size=1024):
+        """
+        Find the best matching FAQ for each of many user questions.
+        
+        Questions are preprocessed and vectorized in batches and scored with
+        a single sparse matrix product per batch, instead of one
+        transform/similarity call per question.
+        
+        Args:
+            user_questions (list): Raw user questions
+            threshold (float): Minimum similarity threshold (0-1)
+            batch_size (int): Number of questions scored per matrix product
+            
+        Returns:
+            list: Best matching FAQ per question (same format as get_best_match),
+                  or None where the question has no match above threshold
+        """
+        results = []
+        
+        for start in range(0, len(user_questions), batch_size):
+            batch = user_questions[start:start + batch_size]
+            processed_questions = self.preprocessor.process_many(
+                question if question and question.strip() else "" for question in batch
+            )
+            
+            user_vectors = self._vectorize(processed_questions)
+            
+            if self._inverted_index is not None or self._ivf_index is not None:
+                best_indices = []
+                best_scores = []
+                for row in range(len(batch)):
+                    indices, scores = self._search(user_vectors[row:row + 1], 1)
+                    best_indices.append(indices[0])
+                    best_scores.append(scores[0])
+            elif self._embedding_index is not None:
+                similarities = self._embedding_index.similarities(user_vectors)
+                best_indices = similarities.argmax(axis=1)
+                best_scores = similarities[np.arange(len(batch)), best_indices]
+            else:
+                # TF-IDF rows are L2-normalized, so the dot product is the cosine similarity
+                similarities = (user_vectors @ self.faq_vectors.T).tocsr()
+                similarities.sort_indices()
+                
+                best_indices = np.asarray(similarities.argmax(axis=1)).ravel()
+                best_scores = similarities.max(axis=1).toarray().ravel()
+            
+            for row, question in enumerate(batch):
+                best_score = best_scores[row]
+                if processed_questions[row] and best_score >= threshold:
+                    results.append(self._build_result(
+                        best_indices[row], best_score, question, processed_questions[row]
+                    ))
+                else:
+                    results.append(None)
+        
+        return results
+    
+    def _search_question(self, processed_question, top_k):
+        """
+        Find the top k FAQs for a preprocessed question, using the cache if enabled.
+        
+        Returns:
+            tuple: (indices, scores) arrays in descending score order
+        """
+        started = metrics.start()
+        if self.cache is not None:
+            key = (self.generation, processed_question, top_k)
+            cached = self.cache.get(key)
+            started = metrics.lap('cache_lookup', started)
+            if cached is not None:
+                return cached
+        
+        user_vector = self._vectorize([processed_question])
+        started = metrics.lap('vectorize', started)
+        result = self._search(user_vector, top_k)
+        metrics.lap('similarity', started)
+        
+        if self.cache is not None:
+            self.cache.put(key, result)
+        return result
+    
+    def _vectorize(self, processed_questions):
+        """
+        Vectorize preprocessed questions with the selected backend.
+        
+        Returns:
+            scipy.sparse.csr_matrix or numpy.ndarray: One TF-IDF vector or embedding per question
+        """
+        if self._embedding_index is not None:
+            return self._embedding_index.encode(processed_questions)
+        return self.vectorizer.transform(processed_questions)
+    
+    def _search(self, user_vector, top_k):
+        """
+        Find the top k FAQs for a vectorized question with the selected engine.
+        
+        Args:
+            user_vector (scipy.sparse.csr_matrix): 1 x n_features TF-IDF vector
+                                                   (1 x dimensions embedding for the embedding backend)
+            top_k (int): Number of FAQs to return
+            
+        Returns:
+            tuple: (indices, scores) arrays in descending score order
+        """
+        if self._inverted_index is not None:
+            return self._inverted_index.search(user_vector, top_k)
+        if self._ivf_index is not None:
+            return self._ivf_index.search(user_vector[0], top_k, self.ivf_nprobe)
+        
+        similarities = self._similarities(user_vector)
+        indices = top_k_indices(similarities, top_k)
+        return indices, similarities[indices]
+    
+    def _similarities(self, user_vector):
+        """
+        Score a vectorized question against every FAQ.
+        
+        Both the query and the FAQ rows are L2-normalized, so the sparse dot
+        product equals the cosine similarity without renormalizing the FAQ
+        matrix on every call.
+        
+        Returns:
+            numpy.ndarray: Cosine similarity per FAQ
+        """
+        if self._embedding_index is not None:
+            return self._embedding_index.similarities(user_vector)[0]
+        return (self.faq_vectors @ user_vector.T).toarray().ravel()
+    
+    def _build_result(self, index, score, user_question, processed_question):
+        """Build a match result for the FAQ at index; its text is decoded on access."""
+        return MatchResult(self.faqs, int(index), score, user_question, processed_question)
+    
     def get_answer(self, user_question, threshold=0.1):
         """
         Get the answer for a user question.
@@ -131,17 +755,81 @@ class FAQMatcher:
         else:
             return "I'm sorry, I couldn't find a relevant answer. Please try rephrasing your question."
 
+# Maximum number of distinct FAQ sets whose fitted matchers are kept alive
+MATCHER_REGISTRY_SIZE = 8
+
+class _RegistryEntry:
+    __slots__ = ('lock', 'matcher')
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.matcher = None
+
+_registry = OrderedDict()
+_registry_lock = threading.Lock()
+
+def get_matcher(faqs=None, key=None):
+    """
+    Get a shared, fitted matcher for a FAQ set.
+    
+    Matchers are kept in a process-wide LRU registry keyed by the content
+    hash of the FAQs, so repeated calls with the same FAQs reuse one fitted
+    matcher instead of refitting TF-IDF. Each FAQ set is built at most once
+    even when many threads ask for it at the same time.
+    
+    Args:
+        faqs (list): Optional list of preprocessed FAQs. If None, the FAQs in faqs.py
+                     as it is on disk now
+        key (str): Precomputed content hash of faqs (see faq_index.faqs_hash), for
+                   callers that already know it; computed from faqs otherwise
+        
+    Returns:
+        FAQMatcher: Fitted matcher for the FAQ set
+    """
+    from faq_index import faqs_hash, read_faqs_source
+    
+    if faqs is None:
+        # Key and build from the same read of faqs.py, which may have been
+        # edited since the faqs module was imported
+        raw_faqs, file_key = read_faqs_source()
+        key = key or file_key
+    elif key is None:
+        key = faqs_hash(faqs)
+    
+    with _registry_lock:
+        entry = _registry.get(key)
+        if entry is None:
+            entry = _RegistryEntry()
+            _registry[key] = entry
+            while len(_registry) > MATCHER_REGISTRY_SIZE:
+                _registry.popitem(last=False)
+        else:
+            _registry.move_to_end(key)
+    
+    # Build outside the registry lock so other FAQ sets are not blocked
+    with entry.lock:
+        if entry.matcher is None:
+            entry.matcher = FAQMatcher(preprocess_faqs(raw_faqs) if faqs is None else faqs)
+        return entry.matcher
+
+def clear_matcher_registry():
+    """Drop all shared matchers, e.g. after the FAQs were edited in place."""
+    with _registry_lock:
+        _registry.clear()
+
 def get_best_match(user_question, faqs=None, threshold=0.1):
     """
     Convenience function to get the best matching FAQ.
     
+    Uses the shared matcher for the FAQ set, see get_matcher().
+    
     Args:
         user_question (str): Raw user question
         faqs (list): Optional list of FAQs
         threshold (float): Minimum similarity threshold
         
     Returns:
-        dict: Best matching FAQ or None
+        MatchResult: Best matching FAQ or None
     """
-    matcher = FAQMatcher(faqs)
+    matcher = get_matcher(faqs)
     return matcher.get_best_match(user_question, threshold)
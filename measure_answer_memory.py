@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Answer Memory Measurement
+Builds FAQ indexes whose answers total from a few MB to a few hundred MB,
+then measures in a fresh worker process how much anonymous (non-shareable)
+memory it holds after loading the index and answering questions, with the
+answers memory-mapped from the index versus copied into RAM (Linux only).
+
+Usage:
+    python measure_answer_memory.py [--faqs 2000]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ANSWER_SIZES = [1000, 10000, 100000]
+
+# Snippet executed in a fresh interpreter; prints a JSON dict of memory in kB
+PROBE = """
+import json, sys
+from faq_index import load_index
+from faq_store import FAQStore
+from matcher import FAQMatcher
+from synthetic_faqs import generate_questions
+index = load_index(INDEX_PATH)
+if MODE == 'ram':
+    index['faqs'] = FAQStore.from_faqs(iter(index['faqs']))
+matcher = FAQMatcher(index=index)
+for question in generate_questions(200):
+    match = matcher.get_best_match(question, threshold=0.0)
+    match and match['answer']
+memory = {}
+with open('/proc/self/status') as f:
+    for line in f:
+        name, _, value = line.partition(':')
+        if name in ('RssAnon', 'RssFile'):
+            memory[name] = int(value.split()[0])
+print(json.dumps(memory))
+"""
+
+def build_index(path, count, answer_bytes):
+    """Save an index of synthetic FAQs whose answers are answer_bytes long."""
+    from faq_index import save_index
+    from matcher import FAQMatcher
+    from preprocess import preprocess_faqs
+    from synthetic_faqs import generate_faqs
+    
+    faqs = generate_faqs(count)
+    for faq in faqs:
+        faq['answer'] = (faq['answer'] + ' ') * (answer_bytes // len(faq['answer']) + 1)
+        faq['answer'] = faq['answer'][:answer_bytes]
+    save_index(FAQMatcher(preprocess_faqs(faqs)), path, 'synthetic')
+
+def run_probe(path, mode):
+    """Load the index in a fresh interpreter and return its memory usage."""
+    probe = PROBE.replace('INDEX_PATH', repr(path)).replace('MODE', repr(mode))
+    result = subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True, check=True, cwd=BASE_DIR)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def measure_answer_memory(count):
+    """Run the measurement and print the report."""
+    print("📦 Answer Memory Measurement")
+    print("=" * 60)
+    print(f"{'answers MB':>10} {'mode':>6} {'RssAnon MB':>11} {'RssFile MB':>11}")
+    print("-" * 60)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for answer_bytes in ANSWER_SIZES:
+            path = os.path.join(tmp_dir, f'index-{answer_bytes}')
+            build_index(path, count, answer_bytes)
+            for mode in ('mmap', 'ram'):
+                memory = run_probe(path, mode)
+                print(f"{count * answer_bytes / 1e6:>10.1f} {mode:>6} "
+                      f"{memory['RssAnon'] / 1024:>11.1f} {memory['RssFile'] / 1024:>11.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure worker memory against total answer volume")
+    parser.add_argument('--faqs', type=int, default=2000, help='FAQs per index')
+    args = parser.parse_args()
+    
+    measure_answer_memory(args.faqs)
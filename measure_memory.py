@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Worker Memory Measurement
+Starts prefork_server.py, sends some traffic so every worker has answered
+questions, and reports per-process memory from /proc (Linux only):
+    RSS - resident memory, counting pages shared with other processes
+    PSS - resident memory with shared pages split between their users
+    USS - memory unique to the process, what each extra worker really costs
+
+Usage:
+    python measure_memory.py [--workers 4] [--port 5055]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import time
+from faqs import faqs
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def read_memory(pid):
+    """
+    Read memory statistics of a process.
+    
+    Returns:
+        dict: 'rss', 'pss' and 'uss' in kB
+    """
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                values[parts[0][:-1]] = int(parts[1])
+    return {
+        'rss': values.get('Rss', 0),
+        'pss': values.get('Pss', 0),
+        'uss': values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)
+    }
+
+def child_pids(pid):
+    """Get the pids of the direct children of a process."""
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(child) for child in f.read().split()]
+
+def wait_for_server(port, timeout=120):
+    """Wait until the server accepts connections."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/examples')
+            connection.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("Server did not start in time")
+
+def send_traffic(port, requests):
+    """Send /ask requests over fresh connections so they spread across workers."""
+    for i in range(requests):
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+        body = json.dumps({'question': faqs[i % len(faqs)]['question']})
+        connection.request('POST', '/ask', body, {'Content-Type': 'application/json'})
+        connection.getresponse().read()
+        connection.close()
+
+def measure_memory(workers, port, requests=200):
+    """Run the measurement and print the report."""
+    print("🧠 Worker Memory Measurement")
+    print("=" * 50)
+    
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(BASE_DIR, 'prefork_server.py'),
+         '--workers', str(workers), '--host', '127.0.0.1', '--port', str(port)],
+        stdout=subprocess.DEVNULL
+    )
+    try:
+        wait_for_server(port)
+        send_traffic(port, requests)
+        
+        parent = read_memory(server.pid)
+        children = {pid: read_memory(pid) for pid in child_pids(server.pid)}
+        
+        print(f"{'process':<16} {'RSS kB':>10} {'PSS kB':>10} {'USS kB':>10}")
+        print("-" * 50)
+        print(f"{'parent ' + str(server.pid):<16} {parent['rss']:>10} {parent['pss']:>10} {parent['uss']:>10}")
+        for pid, memory in children.items():
+            print(f"{'worker ' + str(pid):<16} {memory['rss']:>10} {memory['pss']:>10} {memory['uss']:>10}")
+        
+        if children:
+            mean_uss = sum(memory['uss'] for memory in children.values()) / len(children)
+            mean_rss = sum(memory['rss'] for memory in children.values()) / len(children)
+            total_pss = parent['pss'] + sum(memory['pss'] for memory in children.values())
+            print("-" * 50)
+            print(f"Mean worker RSS: {mean_rss / 1024:.1f} MB (what independent workers would each hold)")
+            print(f"Mean worker USS: {mean_uss / 1024:.1f} MB (actual cost of one more worker)")
+            print(f"Total PSS:       {total_pss / 1024:.1f} MB for {len(children)} workers")
+    finally:
+        server.terminate()
+        server.wait()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure per-worker memory of the pre-fork server")
+    parser.add_argument('--workers', type=int, default=4, help='Number of worker processes')
+    parser.add_argument('--port', type=int, default=5055, help='Port for the temporary server')
+    args = parser.parse_args()
+    
+    measure_memory(args.workers, args.port)
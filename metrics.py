@@ -0,0 +1,172 @@
+"""
+Latency Metrics
+Hot-path stage timers aggregated into fixed-bucket histograms, plus simple
+counters, rendered in the Prometheus text exposition format.
+
+Instrumented code brackets each stage with start() and lap():
+
+    started = metrics.start()
+    processed = preprocessor.process(question)
+    started = metrics.lap('preprocess', started)
+    vector = vectorizer.transform([processed])
+    metrics.lap('vectorize', started)
+
+While metrics are disabled (the default), start() returns 0 and lap()
+returns at once, so an instrumented call costs a few global lookups and no
+clock reads. Metrics are kept per process.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+
+# Upper bounds in seconds of the stage latency histogram buckets (+Inf is implicit)
+STAGE_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+                 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+# Help text of the counters, by counter name
+COUNTER_HELP = {
+    'chatbot_answers_total': 'Questions answered, by outcome (matched or no_match)'
+}
+
+ENABLED = False
+
+class Histogram:
+    """Thread-safe cumulative histogram with fixed bucket bounds."""
+    
+    def __init__(self, bounds=STAGE_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+    
+    def observe(self, value):
+        """Record one value."""
+        bucket = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[bucket] += 1
+            self.sum += value
+            self.count += 1
+    
+    def snapshot(self):
+        """
+        Read the histogram consistently.
+        
+        Returns:
+            tuple: (cumulative count per bound, +Inf last; sum; count)
+        """
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative = []
+        running = 0
+        for bucket_count in counts:
+            running += bucket_count
+            cumulative.append(running)
+        return cumulative, total, count
+
+_stages = {}
+_counters = {}
+_lock = threading.Lock()
+
+def enable(enabled=True):
+    """Turn recording on or off for this process."""
+    global ENABLED
+    ENABLED = enabled
+
+def start():
+    """
+    Start timing a stage.
+    
+    Returns:
+        float: The current time, or 0 while metrics are disabled
+    """
+    return time.perf_counter() if ENABLED else 0.0
+
+def lap(stage, started):
+    """
+    Record the time since started as one observation of a stage.
+    
+    Args:
+        stage (str): Stage name, the 'stage' label of chatbot_stage_seconds
+        started (float): Value returned by start() or the previous lap()
+    
+    Returns:
+        float: The current time, to start the next stage from, or 0 while disabled
+    """
+    if not started:
+        return 0.0
+    now = time.perf_counter()
+    histogram = _stages.get(stage)
+    if histogram is None:
+        with _lock:
+            histogram = _stages.setdefault(stage, Histogram())
+    histogram.observe(now - started)
+    return now
+
+def increment(name, amount=1, **labels):
+    """
+    Add to a counter while metrics are enabled.
+    
+    Args:
+        name (str): Counter name, see COUNTER_HELP
+        amount (int): Amount to add
+        **labels: Label values of the series
+    """
+    if not ENABLED:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+def counter_value(name, **labels):
+    """Current value of a counter series (0 if it was never incremented)."""
+    return _counters.get((name, tuple(sorted(labels.items()))), 0)
+
+def reset():
+    """Drop all recorded stages and counters."""
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in labels) + '}'
+
+def render(gauges=()):
+    """
+    Render all metrics in the Prometheus text exposition format (version 0.0.4).
+    
+    Args:
+        gauges (iterable): (name, help, value) tuples of point-in-time values
+                           to include, such as the index size
+    
+    Returns:
+        str: Exposition text
+    """
+    lines = [
+        '# HELP chatbot_stage_seconds Time spent in each stage of answering a question',
+        '# TYPE chatbot_stage_seconds histogram'
+    ]
+    for stage, histogram in sorted(_stages.items()):
+        cumulative, total, count = histogram.snapshot()
+        for bound, bucket_count in zip(histogram.bounds + ('+Inf',), cumulative):
+            lines.append(f'chatbot_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {bucket_count}')
+        lines.append(f'chatbot_stage_seconds_sum{{stage="{stage}"}} {total:.9f}')
+        lines.append(f'chatbot_stage_seconds_count{{stage="{stage}"}} {count}')
+    
+    with _lock:
+        counters = sorted(_counters.items())
+    for name in sorted({name for (name, _), _ in counters}):
+        lines.append(f'# HELP {name} {COUNTER_HELP.get(name, name)}')
+        lines.append(f'# TYPE {name} counter')
+        for (series, labels), value in counters:
+            if series == name:
+                lines.append(f'{name}{_format_labels(labels)} {value}')
+    
+    for name, help_text, value in gauges:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} gauge')
+        lines.append(f'{name} {value}')
+    return '\n'.join(lines) + '\n'
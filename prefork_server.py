@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Pre-fork Web Server
+Serves web_chatbot.py from N worker processes that all share one FAQ index.
+The parent loads the memory-mapped matcher index and the NLP resources once,
+freezes the garbage collector's view of them and then forks the workers, so
+workers inherit everything copy-on-write instead of loading their own copy.
+Each worker accepts connections on the same listening socket.
+
+Index reloads reach every worker. POST /admin/reload on any worker, SIGHUP
+sent to the parent, or a change of the FAQ source (with
+CHATBOT_RELOAD_INTERVAL set) makes the parent rebuild the index once in a
+builder process and then signal each worker to load it.
+
+Usage:
+    python prefork_server.py [--workers 4] [--host 0.0.0.0] [--port 5000]
+"""
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+
+def load_shared_state():
+    """
+    Load everything the workers should share, in the parent process.
+    
+    Returns:
+        flask.Flask: The web chatbot application
+    """
+    import web_chatbot
+    
+    # Load the preprocessing resources now so the workers do not each load them
+    web_chatbot.knowledge_base.matcher.preprocessor.warm_up()
+    return web_chatbot.app
+
+def create_listener(host, port, backlog=1024):
+    """Create the listening socket shared by all workers."""
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((host, port))
+    listener.listen(backlog)
+    return listener
+
+# Signals whose handlers a forked child replaces; they stay blocked across
+# fork() so the child never runs the parent's handlers
+CHILD_SIGNALS = {signal.SIGHUP, signal.SIGTERM, signal.SIGINT}
+
+# Seconds between checks of the parent's loop for exited children and reloads
+POLL_INTERVAL = 0.2
+
+def reload_all_workers():
+    """
+    Ask the parent to rebuild the FAQ index and reload it in every worker.
+    
+    Returns:
+        bool: Always True, the reload runs asynchronously
+    """
+    os.kill(os.getppid(), signal.SIGHUP)
+    return True
+
+def fork_child(target, *args):
+    """
+    Fork a process running target(*args) and return its pid.
+    
+    CHILD_SIGNALS are blocked across the fork; target installs its own
+    handlers and then unblocks them.
+    """
+    mask = signal.pthread_sigmask(signal.SIG_BLOCK, CHILD_SIGNALS)
+    pid = os.fork()
+    if pid == 0:
+        status = 0
+        try:
+            target(*args)
+        except SystemExit:
+            pass
+        except BaseException:
+            traceback.print_exc()
+            status = 1
+        finally:
+            os._exit(status)
+    signal.pthread_sigmask(signal.SIG_SETMASK, mask)
+    return pid
+
+def run_worker(app, host, port, listener, reload=False):
+    """
+    Serve requests forever from a forked worker process.
+    
+    Args:
+        reload (bool): Reload the index inherited from the parent before serving,
+                       for workers started after the parent's index may have gone stale
+    """
+    from werkzeug.serving import make_server
+    import web_chatbot
+    
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # The parent rebuilds the index once and then signals every worker,
+    # which only loads the saved index; workers run no FAQ watcher
+    signal.signal(signal.SIGHUP, lambda signum, frame: web_chatbot.knowledge_base.reload())
+    web_chatbot.reload_hook = reload_all_workers
+    signal.pthread_sigmask(signal.SIG_UNBLOCK, CHILD_SIGNALS)
+    
+    if reload:
+        web_chatbot.knowledge_base.reload()
+    
+    server = make_server(host, port, app, threaded=True, fd=listener.fileno())
+    server.serve_forever()
+
+def run_builder():
+    """Rebuild and save the FAQ index if it is stale, in a short-lived child process."""
+    import web_chatbot
+    
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    signal.pthread_sigmask(signal.SIG_UNBLOCK, CHILD_SIGNALS)
+    
+    web_chatbot.load_matcher()
+
+def serve(workers, host, port):
+    """
+    Start the workers and restart any that exit until interrupted.
+    
+    The parent also coordinates reloads. On SIGHUP (sent by a worker for
+    POST /admin/reload) or a change of the FAQ source while
+    CHATBOT_RELOAD_INTERVAL is set, one builder process rebuilds and saves
+    the index, and then every worker is signalled to load it. Only one
+    process rebuilds, and the workers keep sharing the saved index.
+    """
+    from faq_reloader import file_signature
+    import web_chatbot
+    
+    app = load_shared_state()
+    listener = create_listener(host, port)
+    
+    # Move the loaded objects out of the GC's young generations so collections
+    # in the workers do not write to (and so copy) the shared pages
+    gc.freeze()
+    
+    state = {'stopping': False, 'reload': False}
+    
+    def request_reload(signum, frame):
+        state['reload'] = True
+    
+    signal.signal(signal.SIGHUP, request_reload)
+    
+    children = {fork_child(run_worker, app, host, port, listener) for _ in range(workers)}
+    print(f"🚀 Serving on http://{host}:{port} with {workers} workers (parent pid {os.getpid()})")
+    
+    builder = None
+    
+    def stop(signum, frame):
+        state['stopping'] = True
+        for pid in children | ({builder} if builder else set()):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    
+    watch_path = web_chatbot.faq_source_path()
+    watch_interval = web_chatbot.RELOAD_INTERVAL
+    last_signature = file_signature(watch_path)
+    next_check = time.monotonic() + watch_interval
+    
+    while children or builder:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        
+        if pid == builder:
+            builder = None
+            if os.waitstatus_to_exitcode(status) == 0:
+                for worker in children:
+                    try:
+                        os.kill(worker, signal.SIGHUP)
+                    except ProcessLookupError:
+                        pass
+            elif not state['stopping']:
+                print("⚠️  Rebuilding the FAQ index failed; workers keep the current one")
+        elif pid:
+            children.discard(pid)
+            if not state['stopping']:
+                print(f"⚠️  Worker {pid} exited, starting a replacement")
+                time.sleep(0.1)
+                # The parent's index predates any reloads, so the replacement loads a current one
+                children.add(fork_child(run_worker, app, host, port, listener, True))
+        
+        if state['stopping']:
+            if not pid:
+                time.sleep(POLL_INTERVAL)
+            continue
+        
+        if watch_interval > 0 and time.monotonic() >= next_check:
+            next_check = time.monotonic() + watch_interval
+            signature = file_signature(watch_path)
+            if signature is not None and signature != last_signature:
+                last_signature = signature
+                state['reload'] = True
+        
+        # A request arriving during a build is served by another build afterwards
+        if state['reload'] and builder is None:
+            state['reload'] = False
+            builder = fork_child(run_builder)
+        
+        if not pid:
+            time.sleep(POLL_INTERVAL)
+    
+    listener.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve the web chatbot from pre-forked workers")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Number of worker processes')
+    parser.add_argument('--host', default='0.0.0.0', help='Host to bind')
+    parser.add_argument('--port', type=int, default=5000, help='Port to bind')
+    args = parser.parse_args()
+    
+    serve(args.workers, args.host, args.port)
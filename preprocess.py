@@ -1,34 +1,245 @@
+import multiprocessing
+import os
 import re
-import nltk
-import spacy
 import ssl
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-
-# Handle SSL certificate issues for NLTK downloads
-try:
-    _create_unverified_https_context = ssl._create_unverified_context
-except AttributeError:
-    pass
-else:
-    ssl._create_default_https_context = _create_unverified_https_context
-
-# Download required NLTK data
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
-
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
-
-# Load SpaCy model
-nlp = spacy.load('en_core_web_sm')
-
-# Initialize lemmatizer
-lemmatizer = WordNetLemmatizer()
+import threading
+import time
+from functools import lru_cache
+
+import metrics
+
+# NLTK corpora needed by the pipeline, mapped to their nltk.data lookup paths
+NLTK_RESOURCES = {
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet',
+}
+
+SPACY_MODEL = 'en_core_web_sm'
+
+# spaCy model providing static word vectors for the embedding backend
+# (the small model ships without them)
+EMBEDDING_MODEL = 'en_core_web_md'
+
+# Texts per task sent to a preprocessing worker process
+PARALLEL_CHUNK_SIZE = 500
+
+def ensure_nltk_data(name):
+    """
+    Make sure an NLTK corpus is available, downloading it if necessary.
+    
+    Args:
+        name (str): Corpus name, a key of NLTK_RESOURCES
+    """
+    import nltk
+    
+    try:
+        nltk.data.find(NLTK_RESOURCES[name])
+    except LookupError:
+        # Handle SSL certificate issues for NLTK downloads
+        try:
+            _create_unverified_https_context = ssl._create_unverified_context
+        except AttributeError:
+            pass
+        else:
+            ssl._create_default_https_context = _create_unverified_https_context
+        nltk.download(name)
+
+class ResourceRegistry:
+    """
+    Registry of heavyweight NLP resources that are loaded on first use.
+    
+    Importing this module is cheap: spaCy, the NLTK stopwords corpus and the
+    WordNet lemmatizer are only loaded when a pipeline stage asks for them,
+    and each load is timed so start-up cost can be reported.
+    """
+    
+    def __init__(self):
+        self._loaders = {}
+        self._resources = {}
+        self._timings = {}
+        self._lock = threading.Lock()
+    
+    def register(self, name, loader):
+        """
+        Register a zero-argument loader for a resource.
+        
+        Args:
+            name (str): Resource name
+            loader (callable): Function returning the loaded resource
+        """
+        with self._lock:
+            self._loaders[name] = loader
+            self._resources.pop(name, None)
+            self._timings.pop(name, None)
+    
+    def get(self, name):
+        """
+        Get a resource, loading it on first access.
+        
+        Args:
+            name (str): Resource name
+        
+        Returns:
+            object: The loaded resource
+        """
+        try:
+            return self._resources[name]
+        except KeyError:
+            pass
+        
+        with self._lock:
+            if name not in self._resources:
+                start = time.perf_counter()
+                self._resources[name] = self._loaders[name]()
+                self._timings[name] = time.perf_counter() - start
+            return self._resources[name]
+    
+    def is_loaded(self, name):
+        """Return True if the resource has already been loaded."""
+        return name in self._resources
+    
+    def timings(self):
+        """
+        Get load times of the resources loaded so far.
+        
+        Returns:
+            dict: Resource name -> load time in seconds
+        """
+        return dict(self._timings)
+
+def _load_nlp():
+    import spacy
+    return spacy.load(SPACY_MODEL)
+
+def _load_word_vectors():
+    import spacy
+    # Only the vocabulary and its vectors table are needed, not the pipeline
+    return spacy.load(EMBEDDING_MODEL, exclude=['tok2vec', 'tagger', 'parser', 'attribute_ruler',
+                                                'lemmatizer', 'ner', 'senter']).vocab.vectors
+
+def _load_stopwords():
+    ensure_nltk_data('stopwords')
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words('english'))
+
+def _load_lemmatizer():
+    ensure_nltk_data('wordnet')
+    from nltk.stem import WordNetLemmatizer
+    return WordNetLemmatizer()
+
+resources = ResourceRegistry()
+resources.register('nlp', _load_nlp)
+resources.register('stopwords', _load_stopwords)
+resources.register('lemmatizer', _load_lemmatizer)
+resources.register('word_vectors', _load_word_vectors)
+
+def __getattr__(name):
+    # Keep the old module attributes working without loading them at import
+    if name in ('nlp', 'lemmatizer'):
+        return resources.get(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class Preprocessor:
+    """
+    Reusable text preprocessing pipeline.
+    
+    The stopword set, compiled regular expressions and a bounded LRU cache
+    of lemmas are built once and shared by every call, instead of being
+    rebuilt for each piece of text. NLP resources are still only loaded
+    the first time text is processed.
+    """
+    
+    def __init__(self, lemma_cache_size=10000, registry=None):
+        """
+        Initialize the preprocessor.
+        
+        Args:
+            lemma_cache_size (int): Maximum number of cached token lemmas
+            registry (ResourceRegistry): Resource registry, defaults to the module registry
+        """
+        self.lemma_cache_size = lemma_cache_size
+        self._registry = registry or resources
+        self._punctuation = re.compile(r'[^\w\s]')
+        self._stop_words = None
+        self._lemmatize = None
+        self._lock = threading.Lock()
+    
+    def _load(self):
+        with self._lock:
+            if self._lemmatize is None:
+                self._stop_words = self._registry.get('stopwords')
+                lemmatizer = self._registry.get('lemmatizer')
+                self._lemmatize = lru_cache(maxsize=self.lemma_cache_size)(lemmatizer.lemmatize)
+    
+    def warm_up(self):
+        """
+        Load the NLP resources by preprocessing a sample sentence, so the
+        first real question does not wait for them (call before forking
+        workers to share them copy-on-write).
+        """
+        self.process("warm up the preprocessing pipeline")
+    
+    def process(self, text, timed=False):
+        """
+        Preprocess text for FAQ matching by:
+        - Lowercasing
+        - Tokenizing
+        - Removing stopwords
+        - Removing punctuation and special characters
+        - Lemmatizing words
+        
+        Args:
+            text (str): Input text to preprocess
+            timed (bool): Record the tokenize and lemmatize stage timers; only
+                          user questions are timed, not FAQs being indexed
+            
+        Returns:
+            str: Preprocessed text
+        """
+        if not text or not isinstance(text, str):
+            return ""
+        
+        if self._lemmatize is None:
+            self._load()
+        
+        # Lowercase, strip punctuation and tokenize using simple split
+        started = metrics.start() if timed else 0.0
+        tokens = self._punctuation.sub('', text.lower()).split()
+        started = metrics.lap('tokenize', started)
+        
+        # Remove stopwords and lemmatize the remaining tokens
+        stop_words = self._stop_words
+        lemmatize = self._lemmatize
+        processed = ' '.join([lemmatize(token) for token in tokens if token not in stop_words])
+        metrics.lap('lemmatize', started)
+        return processed
+    
+    def process_many(self, texts):
+        """
+        Preprocess a sequence of texts.
+        
+        Args:
+            texts (iterable): Texts to preprocess
+            
+        Returns:
+            list: Preprocessed texts, in input order
+        """
+        process = self.process
+        return [process(text) for text in texts]
+    
+    def cache_info(self):
+        """
+        Get statistics of the lemma cache.
+        
+        Returns:
+            functools._CacheInfo: Hits, misses, maxsize and current size, or None before first use
+        """
+        if self._lemmatize is None:
+            return None
+        return self._lemmatize.cache_info()
+
+# Shared pipeline used by the module-level helpers and FAQMatcher
+default_preprocessor = Preprocessor()
 
 def preprocess_text(text):
     """
@@ -45,45 +256,112 @@ def preprocess_text(text):
     Returns:
         str: Preprocessed text
     """
-    if not text or not isinstance(text, str):
-        return ""
+    return default_preprocessor.process(text)
+
+# Set in the parent before a pool forks, so the workers inherit the loaded pipeline
+_pool_preprocessor = None
+
+def _process_chunk(texts):
+    return _pool_preprocessor.process_many(texts)
+
+class PreprocessPool:
+    """
+    Preprocess large batches of text across forked worker processes.
     
-    # Convert to lowercase
-    text = text.lower()
+    Offers the same process()/process_many() interface as Preprocessor, so
+    it can be passed to preprocess_faqs() while an index is built. The NLP
+    resources are loaded in the parent before forking and inherited by the
+    workers. Only the texts travel to the workers, in chunks, and results
+    come back in input order. With one worker, for small batches or where
+    fork() is unavailable, texts are processed serially.
+    """
     
-    # Remove special characters and punctuation
-    text = re.sub(r'[^\w\s]', '', text)
+    def __init__(self, workers=None, chunk_size=PARALLEL_CHUNK_SIZE, preprocessor=None):
+        """
+        Initialize the pool. Worker processes are started on first use.
+        
+        Args:
+            workers (int): Number of worker processes, defaults to the CPU count
+            chunk_size (int): Maximum texts per worker task
+            preprocessor (Preprocessor): Pipeline to run, defaults to the shared one
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.preprocessor = preprocessor or default_preprocessor
+        self._pool = None
     
-    # Tokenize using simple split
-    tokens = text.split()
+    def __enter__(self):
+        return self
     
-    # Remove stopwords
-    stop_words = set(stopwords.words('english'))
-    tokens = [token for token in tokens if token not in stop_words]
+    def __exit__(self, *exc_info):
+        self.close()
     
-    # Lemmatize words
-    tokens = [lemmatizer.lemmatize(token) for token in tokens]
+    def process(self, text, timed=False):
+        """Preprocess a single text in this process."""
+        return self.preprocessor.process(text, timed)
     
-    # Join tokens back into string
-    processed_text = ' '.join(tokens)
+    def process_many(self, texts):
+        """
+        Preprocess a sequence of texts across the worker processes.
+        
+        Args:
+            texts (iterable): Texts to preprocess
+            
+        Returns:
+            list: Preprocessed texts, in input order
+        """
+        texts = list(texts)
+        if (self.workers == 1 or len(texts) <= self.chunk_size
+                or 'fork' not in multiprocessing.get_all_start_methods()):
+            return self.preprocessor.process_many(texts)
+        
+        # Use smaller tasks for batches too small to keep every worker busy
+        chunk_size = min(self.chunk_size, -(-len(texts) // self.workers))
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        
+        processed = []
+        for chunk in self._get_pool().map(_process_chunk, chunks):
+            processed.extend(chunk)
+        return processed
+    
+    def _get_pool(self):
+        global _pool_preprocessor
+        if self._pool is None:
+            self.preprocessor.warm_up()
+            _pool_preprocessor = self.preprocessor
+            self._pool = multiprocessing.get_context('fork').Pool(self.workers)
+        return self._pool
     
-    return processed_text
+    def close(self):
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
 
-def preprocess_faqs(faqs_list):
+def preprocess_faqs(faqs_list, preprocessor=None, workers=1):
     """
     Preprocess all FAQ questions and add processed versions to the data structure.
     
     Args:
         faqs_list (list): List of FAQ dictionaries
+        preprocessor (Preprocessor): Pipeline to use (or a PreprocessPool), defaults to the shared one
+        workers (int): Worker processes to spread the questions over; None uses every CPU
         
     Returns:
         list: Updated FAQ list with preprocessed questions
     """
+    if workers != 1:
+        with PreprocessPool(workers, preprocessor=preprocessor) as pool:
+            return preprocess_faqs(faqs_list, pool)
+    
+    preprocessor = preprocessor or default_preprocessor
+    processed_questions = preprocessor.process_many(faq['question'] for faq in faqs_list)
     processed_faqs = []
     
-    for faq in faqs_list:
+    for faq, processed_question in zip(faqs_list, processed_questions):
         processed_faq = faq.copy()
-        processed_faq['processed_question'] = preprocess_text(faq['question'])
+        processed_faq['processed_question'] = processed_question
         processed_faqs.append(processed_faq)
     
     return processed_faqs
@@ -101,4 +379,4 @@ def get_preprocessed_question(faq):
     if 'processed_question' in faq:
         return faq['processed_question']
     else:
-        return preprocess_text(faq['question'])
+        return default_preprocessor.process(faq['question'])
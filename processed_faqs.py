@@ -1,18 +1,33 @@
+import threading
+
 from faqs import faqs
 from preprocess import preprocess_faqs
 
-# Preprocess all FAQs and store them
-processed_faqs = preprocess_faqs(faqs)
+# Preprocessed FAQs are built on first access rather than at import time
+_processed_faqs = None
+_lock = threading.Lock()
+
+def __getattr__(name):
+    if name == 'processed_faqs':
+        return get_processed_faqs()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Example of how to access preprocessed data
 def get_processed_faqs():
     """
     Get the list of FAQs with preprocessed questions.
     
+    The FAQs are preprocessed the first time this is called.
+    
     Returns:
         list: List of FAQ dictionaries with 'processed_question' field
     """
-    return processed_faqs
+    global _processed_faqs
+    if _processed_faqs is None:
+        with _lock:
+            if _processed_faqs is None:
+                _processed_faqs = preprocess_faqs(faqs)
+    return _processed_faqs
 
 def get_faq_by_index(index):
     """
@@ -24,12 +39,14 @@ def get_faq_by_index(index):
     Returns:
         dict: FAQ dictionary with original and processed question
     """
+    processed_faqs = get_processed_faqs()
     if 0 <= index < len(processed_faqs):
         return processed_faqs[index]
     return None
 
 # Print summary of processed FAQs
 if __name__ == "__main__":
+    processed_faqs = get_processed_faqs()
     print(f"Total FAQs processed: {len(processed_faqs)}")
     print("\nSample processed FAQs:")
     print("-" * 50)
@@ -0,0 +1,226 @@
+"""
+Live Request Profiling
+Profiles individual live requests with cProfile (CPU) and/or tracemalloc
+(memory) and aggregates the results across requests, so latency spikes can
+be investigated on real traffic without redeploying.
+
+Requests are profiled when a caller asks for it (see web_chatbot.py, which
+honors an X-Profile header from admins) or when they are sampled at random.
+Both are bounded by a per-minute limit, and only one request per process is
+profiled at a time, since profilers see the whole interpreter.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+# Profiling modes: 'cpu' runs cProfile, 'memory' runs tracemalloc
+PROFILE_MODES = ('cpu', 'memory')
+
+# Source files whose functions and allocations are reported
+PROFILED_MODULES = ('preprocess.py', 'matcher.py', 'faq_store.py', 'inverted_index.py',
+                    'embeddings.py', 'ivf_index.py', 'hashing_vectorizer.py')
+
+# Frames kept per traced allocation
+TRACEMALLOC_FRAMES = 10
+
+def parse_modes(value):
+    """
+    Parse a comma-separated list of profiling modes, ignoring unknown ones.
+    
+    Returns:
+        frozenset: Requested modes from PROFILE_MODES (empty if none)
+    """
+    return frozenset(mode.strip() for mode in (value or '').lower().split(',') if mode.strip() in PROFILE_MODES)
+
+class RequestProfiler:
+    """Rate-limited per-request profiler with aggregated statistics."""
+    
+    def __init__(self, sample_rate=0.0, sample_modes=('cpu',), max_per_minute=6, dump_dir=None,
+                 modules=PROFILED_MODULES, clock=time.monotonic):
+        """
+        Initialize the profiler.
+        
+        Args:
+            sample_rate (float): Share of requests profiled without being asked (0 disables sampling)
+            sample_modes (iterable): Modes used for sampled requests
+            max_per_minute (int): Most requests profiled per minute, requested or sampled
+            dump_dir (str): Directory the aggregated stats are written to after each profile
+            modules (tuple): Source file names whose functions are reported
+            clock (callable): Time source, replaceable for testing
+        """
+        self.sample_rate = sample_rate
+        self.sample_modes = frozenset(sample_modes)
+        self.max_per_minute = max_per_minute
+        self.dump_dir = dump_dir
+        self.modules = modules
+        self._clock = clock
+        
+        self._active = threading.Lock()
+        self._lock = threading.Lock()
+        self._window_start = clock()
+        self._window_count = 0
+        self.reset()
+    
+    def reset(self):
+        """Drop the aggregated statistics."""
+        with self._lock:
+            self._stats = None
+            self._allocations = Counter()
+            self._allocation_blocks = Counter()
+            self.samples = Counter()
+            self.peak_bytes = 0
+            self.skipped = 0
+    
+    def select(self, requested=None):
+        """
+        Decide how to profile the next request.
+        
+        Args:
+            requested (frozenset): Modes the caller asked for, see parse_modes()
+        
+        Returns:
+            frozenset: Modes to profile with, empty if the request is not profiled
+        """
+        modes = requested
+        if not modes and self.sample_rate > 0 and random.random() < self.sample_rate:
+            modes = self.sample_modes
+        if not modes:
+            return frozenset()
+        
+        with self._lock:
+            now = self._clock()
+            if now - self._window_start >= 60:
+                self._window_start = now
+                self._window_count = 0
+            if self._window_count >= self.max_per_minute:
+                self.skipped += 1
+                return frozenset()
+            self._window_count += 1
+        return modes
+    
+    def run(self, modes, function, *args, **kwargs):
+        """
+        Call function, profiling it with the given modes.
+        
+        The call runs unprofiled if modes is empty, another request is being
+        profiled, or memory profiling is requested while tracemalloc is
+        already in use by someone else.
+        
+        Returns:
+            tuple: (result of function, modes actually profiled)
+        """
+        if not modes or not self._active.acquire(blocking=False):
+            if modes:
+                with self._lock:
+                    self.skipped += 1
+            return function(*args, **kwargs), frozenset()
+        
+        try:
+            if 'memory' in modes and tracemalloc.is_tracing():
+                modes = modes - {'memory'}
+            profile = cProfile.Profile() if 'cpu' in modes else None
+            
+            if 'memory' in modes:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+            if profile is not None:
+                profile.enable()
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                if profile is not None:
+                    profile.disable()
+                snapshot = None
+                peak = 0
+                if 'memory' in modes:
+                    snapshot = tracemalloc.take_snapshot()
+                    peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+            
+            self._record(profile, snapshot, peak)
+            return result, modes
+        finally:
+            self._active.release()
+    
+    def _record(self, profile, snapshot, peak):
+        """Add one profiled request to the aggregated statistics."""
+        with self._lock:
+            if profile is not None:
+                self.samples['cpu'] += 1
+                if self._stats is None:
+                    self._stats = pstats.Stats(profile)
+                else:
+                    self._stats.add(profile)
+            
+            if snapshot is not None:
+                self.samples['memory'] += 1
+                self.peak_bytes = max(self.peak_bytes, peak)
+                # Attribute each allocation to the innermost frame in a reported module
+                # (tracebacks are ordered oldest frame first)
+                for trace in snapshot.traces:
+                    for frame in reversed(trace.traceback):
+                        if os.path.basename(frame.filename) in self.modules:
+                            line = f'{os.path.basename(frame.filename)}:{frame.lineno}'
+                            self._allocations[line] += trace.size
+                            self._allocation_blocks[line] += 1
+                            break
+            
+            if self.dump_dir:
+                self._dump()
+    
+    def _dump(self):
+        """Write the aggregated stats as profile-<pid>.prof and .json. Called with the lock held."""
+        os.makedirs(self.dump_dir, exist_ok=True)
+        name = os.path.join(self.dump_dir, f'profile-{os.getpid()}')
+        if self._stats is not None:
+            self._stats.dump_stats(f'{name}.prof')
+        with open(f'{name}.json', 'w', encoding='utf-8') as f:
+            json.dump(self._summary(), f, indent=2)
+    
+    def summary(self, limit=20):
+        """
+        Summarize the aggregated statistics.
+        
+        Args:
+            limit (int): Number of functions and allocation sites to report
+        
+        Returns:
+            dict: JSON-serializable summary with the hottest functions of the
+                  reported modules (by cumulative time) and their largest
+                  allocation sites
+        """
+        with self._lock:
+            return self._summary(limit)
+    
+    def _summary(self, limit=20):
+        functions = []
+        if self._stats is not None:
+            for (filename, line, name), (_, calls, total, cumulative, _) in self._stats.stats.items():
+                if os.path.basename(filename) in self.modules:
+                    functions.append({
+                        'function': f'{os.path.basename(filename)}:{line}({name})',
+                        'calls': calls,
+                        'total_s': round(total, 6),
+                        'cumulative_s': round(cumulative, 6)
+                    })
+            functions.sort(key=lambda function: function['cumulative_s'], reverse=True)
+        
+        allocations = [
+            {'line': line, 'bytes': size, 'blocks': self._allocation_blocks[line]}
+            for line, size in self._allocations.most_common(limit)
+        ]
+        return {
+            'samples': dict(self.samples),
+            'skipped': self.skipped,
+            'sample_rate': self.sample_rate,
+            'max_per_minute': self.max_per_minute,
+            'hot_functions': functions[:limit],
+            'allocations': allocations,
+            'peak_bytes': self.peak_bytes
+        }
@@ -0,0 +1,101 @@
+"""
+Query result cache for FAQMatcher.
+
+Real traffic repeats the same questions over and over. The cache stores the
+search result for each preprocessed question, so repeated questions skip
+vectorization and similarity scoring. Entries are evicted least recently
+used first once the cache is full, and can optionally expire after a TTL.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+class QueryCache:
+    """Thread-safe LRU cache with optional TTL and hit/miss counters."""
+    
+    def __init__(self, maxsize=1024, ttl=None, clock=time.monotonic):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize (int): Maximum number of cached entries
+            ttl (float): Seconds an entry stays valid, or None to never expire
+            clock (callable): Time source, replaceable for testing
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key):
+        """
+        Look up a cached value.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            object: The cached value, or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+    
+    def put(self, key, value):
+        """
+        Store a value, evicting the least recently used entry if the cache is full.
+        
+        Args:
+            key: Cache key
+            value: Value to cache (must not be None)
+        """
+        expires = self._clock() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        """Drop all entries, e.g. after the FAQ index was rebuilt. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def stats(self):
+        """
+        Get cache statistics.
+        
+        Returns:
+            dict: Size, maxsize, ttl, hits, misses, evictions and hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
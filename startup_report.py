@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Startup Timing Report
+This script measures how long a fresh worker process takes to import the
+chatbot modules, build the matcher and answer its first question.
+Each measurement runs in a new interpreter so nothing is already cached.
+"""
+
+import json
+import subprocess
+import sys
+
+# Snippet executed in a fresh interpreter; prints a JSON dict of timings
+PROBE = """
+import json, sys, time
+timings = {}
+start = time.perf_counter()
+import matcher
+timings['import matcher'] = time.perf_counter() - start
+timings['modules loaded'] = {
+    name: name in sys.modules for name in ('sklearn', 'nltk', 'spacy')
+}
+if STAGE >= 1:
+    start = time.perf_counter()
+    m = matcher.FAQMatcher()
+    timings['build FAQMatcher'] = time.perf_counter() - start
+if STAGE >= 2:
+    start = time.perf_counter()
+    m.get_best_match('How can I reset my password?')
+    timings['first question'] = time.perf_counter() - start
+from preprocess import resources
+timings['resources'] = resources.timings()
+print(json.dumps(timings))
+"""
+
+STAGES = ["import only", "import + build", "import + build + first question"]
+
+def run_probe(stage):
+    """Run the probe in a fresh interpreter and return its timings."""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.replace("STAGE", str(stage))],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def startup_report():
+    """Print the startup timing report."""
+    print("⏱️  Startup Timing Report")
+    print("=" * 50)
+    
+    for stage, description in enumerate(STAGES):
+        timings = run_probe(stage)
+        print(f"\n{description}:")
+        print("-" * 40)
+        for key in ('import matcher', 'build FAQMatcher', 'first question'):
+            if key in timings:
+                print(f"   {key:<20} {timings[key] * 1000:8.1f} ms")
+        
+        loaded = [name for name, is_loaded in timings['modules loaded'].items() if is_loaded]
+        print(f"   Heavy modules loaded by import: {', '.join(loaded) or 'none'}")
+        
+        for name, seconds in timings['resources'].items():
+            print(f"   resource '{name}' loaded in {seconds * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    startup_report()
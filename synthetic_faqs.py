@@ -0,0 +1,73 @@
+"""
+Synthetic FAQ corpora for benchmarks.
+
+Generates large FAQ sets whose questions reuse the vocabulary of faqs.py,
+so term statistics look like the real knowledge base at any size.
+"""
+
+import random
+import re
+from faqs import faqs
+
+QUESTION_STARTS = [
+    "How do I", "How can I", "What is", "Can I", "Do you", "Where can I",
+    "When will", "Why does", "Is it possible to", "What are"
+]
+
+def faq_vocabulary():
+    """
+    Get the words used in faqs.py questions and answers.
+    
+    Returns:
+        list: Sorted list of distinct lowercase words
+    """
+    words = set()
+    for faq in faqs:
+        words.update(re.findall(r'[a-z]+', (faq['question'] + ' ' + faq['answer']).lower()))
+    return sorted(words)
+
+def generate_faqs(count, seed=0, min_words=3, max_words=8):
+    """
+    Generate a synthetic FAQ list.
+    
+    Args:
+        count (int): Number of FAQs to generate
+        seed (int): Random seed, the same seed always gives the same corpus
+        min_words (int): Minimum number of content words per question
+        max_words (int): Maximum number of content words per question
+    
+    Returns:
+        list: List of FAQ dictionaries with 'question' and 'answer'
+    """
+    rng = random.Random(seed)
+    vocabulary = faq_vocabulary()
+    answers = [faq['answer'] for faq in faqs]
+    
+    generated = []
+    for i in range(count):
+        words = rng.sample(vocabulary, rng.randint(min_words, max_words))
+        generated.append({
+            'question': f"{rng.choice(QUESTION_STARTS)} {' '.join(words)}?",
+            'answer': f"{rng.choice(answers)} (ref {i})"
+        })
+    return generated
+
+def generate_questions(count, seed=1):
+    """
+    Generate user-style questions: FAQ questions from faqs.py with extra noise words.
+    
+    Args:
+        count (int): Number of questions to generate
+        seed (int): Random seed
+    
+    Returns:
+        list: List of question strings
+    """
+    rng = random.Random(seed)
+    vocabulary = faq_vocabulary()
+    questions = []
+    for _ in range(count):
+        base = rng.choice(faqs)['question'].rstrip('?')
+        noise = ' '.join(rng.sample(vocabulary, rng.randint(0, 3)))
+        questions.append(f"{base} {noise}?".replace(' ?', '?'))
+    return questions
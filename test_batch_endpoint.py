@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test script for the /ask/batch endpoint, the ASGI backpressure limit and
+the limit parameter of /admin/profile
+"""
+
+import asyncio
+import io
+import json
+import os
+import tempfile
+
+# Keep the test's index out of the working tree
+os.environ.setdefault('CHATBOT_INDEX_PATH', os.path.join(tempfile.mkdtemp(), 'faq_index'))
+
+import web_chatbot
+from asgi_app import ChatbotApp
+
+def post_batch(client, body, content_type='application/json', **kwargs):
+    """POST a batch and return (status code, parsed NDJSON lines or JSON error)."""
+    if not isinstance(body, (bytes, str)):
+        body = json.dumps(body)
+    response = client.post('/ask/batch', data=body, content_type=content_type, **kwargs)
+    if response.mimetype == 'application/x-ndjson':
+        return response.status_code, [json.loads(line) for line in response.data.splitlines()]
+    return response.status_code, response.get_json()
+
+def test_batch_validation():
+    print("🧪 Testing /ask/batch Validation")
+    print("=" * 50)
+    client = web_chatbot.app.test_client()
+    
+    status, results = post_batch(client, [])
+    assert status == 200 and results == [], "An empty batch should give an empty stream"
+    print("✓ Empty list -> empty stream")
+    
+    status, results = post_batch(client, {'questions': 'Where is my order?'})
+    assert status == 400 and not results['success']
+    print("✓ Non-list body -> 400")
+    
+    status, results = post_batch(client, [
+        None, 42, ["Where is my order?"], {'question': None}, {'id': 'q', 'question': 7},
+        "   ", {'id': 'ok', 'question': "Where is my order?"}
+    ])
+    assert status == 200 and len(results) == 7
+    assert [result['id'] for result in results] == [0, 1, 2, 3, 'q', 5, 'ok']
+    for result in results[:5]:
+        assert not result['success'] and 'Invalid question' in result['error'], result
+    assert not results[5]['success'] and results[5]['error'] == 'Please provide a question.'
+    assert results[6]['success'] and results[6]['matched_question'] == "How do I track my order?"
+    assert all(result.get('user_question') != 'None' for result in results)
+    print("✓ Non-string questions are rejected, not matched as text")
+    
+    body = '{"question": null}\nnot json\n\n"Where is my order?"\n'
+    status, results = post_batch(client, body, 'application/x-ndjson')
+    assert status == 200 and [result['success'] for result in results] == [False, False, True]
+    print("✓ NDJSON: null and unparsable lines are rejected, blank lines skipped")
+
+def test_batch_limits():
+    print("\n" + "=" * 60)
+    print("Testing /ask/batch Limits:")
+    print("-" * 50)
+    client = web_chatbot.app.test_client()
+    max_questions, max_bytes = web_chatbot.MAX_BATCH_QUESTIONS, web_chatbot.MAX_BATCH_BYTES
+    
+    try:
+        web_chatbot.MAX_BATCH_QUESTIONS = 3
+        status, results = post_batch(client, ["Where is my order?"] * 4)
+        assert status == 413 and not results['success']
+        status, results = post_batch(client, ["Where is my order?"] * 3)
+        assert status == 200 and len(results) == 3
+        print("✓ JSON array over the question limit -> 413")
+        
+        status, results = post_batch(client, '"Where is my order?"\n' * 4, 'application/x-ndjson')
+        assert status == 200 and len(results) == 1 and 'At most 3' in results[0]['error']
+        print("✓ NDJSON over the question limit -> error line")
+        web_chatbot.MAX_BATCH_QUESTIONS = max_questions
+        
+        web_chatbot.MAX_BATCH_BYTES = 100
+        status, results = post_batch(client, '"Where is my order?"\n' * 10, 'application/x-ndjson')
+        assert status == 413 and not results['success']
+        print("✓ Body over the byte limit -> 413")
+        
+        # Chunked transfer encoding: no Content-Length, read line by line
+        body = b'"Where is my order?"\n' * 3 + b'x' * 1000
+        response = client.post('/ask/batch', input_stream=io.BytesIO(body), content_type='application/x-ndjson',
+                               environ_overrides={'wsgi.input_terminated': True})
+        assert response.status_code == 413, response.status_code
+        print("✓ Chunked body over the byte limit -> 413 without reading it whole")
+    finally:
+        web_chatbot.MAX_BATCH_QUESTIONS, web_chatbot.MAX_BATCH_BYTES = max_questions, max_bytes
+
+async def call_asgi(app, path, body=b'', method='POST', headers=(), query_string=b''):
+    """Send one HTTP request to an ASGI app and return (status, headers, body)."""
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+    
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+    
+    async def send(message):
+        sent.append(message)
+    
+    scope = {'type': 'http', 'path': path, 'method': method, 'headers': list(headers), 'query_string': query_string}
+    await app(scope, receive, send)
+    return sent[0]['status'], dict(sent[0]['headers']), b''.join(m.get('body', b'') for m in sent[1:])
+
+def test_asgi_backpressure():
+    print("\n" + "=" * 60)
+    print("Testing ASGI Backpressure:")
+    print("-" * 50)
+    
+    body = json.dumps({'question': "Where is my order?"}).encode('utf-8')
+    
+    app = ChatbotApp(workers=1, max_in_flight=1)
+    status, _, response = asyncio.run(call_asgi(app, '/ask', body))
+    assert status == 200 and json.loads(response)['success']
+    print("✓ Request under the in-flight limit is answered")
+    
+    app = ChatbotApp(workers=1, max_in_flight=0)
+    status, headers, response = asyncio.run(call_asgi(app, '/ask', body))
+    assert status == 429 and headers[b'retry-after'] == b'1' and not json.loads(response)['success']
+    assert app.rejected == 1
+    print("✓ Request over the in-flight limit -> 429 with Retry-After")
+
+def test_profile_limit():
+    print("\n" + "=" * 60)
+    print("Testing /admin/profile Limit:")
+    print("-" * 50)
+    
+    admin_token = web_chatbot.ADMIN_TOKEN
+    web_chatbot.ADMIN_TOKEN = 'test-token'
+    try:
+        client = web_chatbot.app.test_client()
+        app = ChatbotApp(workers=1)
+        for query, expected in (('', 200), ('limit=5', 200), ('limit=abc', 400), ('limit=0', 400),
+                                ('limit=-3', 400), ('limit=', 400)):
+            response = client.get(f'/admin/profile?{query}', headers={'X-Admin-Token': 'test-token'})
+            assert response.status_code == expected, (query, response.status_code)
+            status, _, _ = asyncio.run(call_asgi(app, '/admin/profile', method='GET',
+                                                 headers=[(b'x-admin-token', b'test-token')],
+                                                 query_string=query.encode('latin-1')))
+            assert status == expected, (query, status)
+        print("✓ Flask and ASGI accept positive limits and reject others with 400")
+    finally:
+        web_chatbot.ADMIN_TOKEN = admin_token
+
+if __name__ == "__main__":
+    test_batch_validation()
+    test_batch_limits()
+    test_asgi_backpressure()
+    test_profile_limit()
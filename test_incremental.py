@@ -0,0 +1,154 @@
+import random
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.preprocessing import normalize
+
+from hashing_vectorizer import smoothed_idf
+from matcher import FAQMatcher
+from preprocess import preprocess_faqs
+from processed_faqs import get_processed_faqs
+
+QUESTIONS = [
+    "I forgot my password, how do I reset it?",
+    "What time are you open?",
+    "Can I pay with a gift card?",
+    "Do you have a loyalty program for students?",
+    "Where is my order?",
+    "xyz123"
+]
+
+def assert_matches_refit(matcher):
+    """Check that every FAQ scores the same as in a matcher fitted from scratch."""
+    refit = FAQMatcher(preprocess_faqs([
+        {'question': faq['question'], 'answer': faq['answer']} for faq in matcher.faqs
+    ]), backend=matcher.backend, hashing_buckets=matcher.hashing_buckets)
+    
+    for question in QUESTIONS:
+        processed_question = matcher.preprocessor.process(question)
+        scores = matcher._similarities(matcher.vectorizer.transform([processed_question]))
+        expected = refit._similarities(refit.vectorizer.transform([processed_question]))
+        assert np.allclose(scores, expected, atol=1e-9), f"Scores differ from a refit for '{question}'"
+
+def test_incremental_updates(backend='tfidf'):
+    print(f"Testing Incremental FAQ Updates ({backend})")
+    print("=" * 50)
+    
+    matcher = FAQMatcher(list(get_processed_faqs()), backend=backend)
+    size = len(matcher.faqs)
+    
+    index = matcher.add_faq("Can I pay with a gift card?", "Yes, gift cards are accepted at checkout.")
+    assert index == size and len(matcher.faqs) == size + 1
+    assert matcher.get_best_match("Can I pay with a gift card?")['question'] == "Can I pay with a gift card?"
+    assert_matches_refit(matcher)
+    print("✓ add_faq scores match a full refit")
+    
+    matcher.update_faq(index, question="Do you have a student loyalty program?",
+                       answer="Students get 10% off with a valid student ID.")
+    assert matcher.faqs[index]['answer'] == "Students get 10% off with a valid student ID."
+    assert_matches_refit(matcher)
+    print("✓ update_faq scores match a full refit")
+    
+    generation = matcher.generation
+    matcher.update_faq(0, answer="A new answer.")
+    assert matcher.generation == generation, "Answer-only updates should not reindex"
+    assert matcher.get_answer(matcher.faqs[0]['question']) == "A new answer."
+    print("✓ Answer-only update keeps the index")
+    
+    removed = matcher.remove_faq(1)
+    assert removed not in matcher.faqs and len(matcher.faqs) == size
+    assert_matches_refit(matcher)
+    print("✓ remove_faq scores match a full refit")
+    
+    # Negative indices count from the end, like list indices
+    matcher.update_faq(-1, question="Can I pay with store credit?")
+    assert matcher.faqs[size - 1]['question'] == "Can I pay with store credit?"
+    assert matcher.faq_vectors.shape[0] == len(matcher.faqs) == size
+    assert len(matcher.get_top_matches("store credit", top_k=size, threshold=0)) == size
+    assert_matches_refit(matcher)
+    removed = matcher.remove_faq(-1)
+    assert removed['question'] == "Can I pay with store credit?" and len(matcher.faqs) == size - 1
+    assert_matches_refit(matcher)
+    for index in (size - 1, -size):
+        try:
+            matcher.update_faq(index, question="Out of range")
+            assert False, f"update_faq({index}) should raise IndexError"
+        except IndexError:
+            pass
+    print("✓ Negative indices update and remove the right FAQ")
+
+def test_compaction():
+    print("\n" + "=" * 60)
+    print("Testing Compaction:")
+    print("-" * 50)
+    
+    for engine in ('brute', 'inverted'):
+        matcher = FAQMatcher(list(get_processed_faqs()), engine=engine)
+        vocabulary_size = len(matcher.vectorizer.vocabulary_)
+        
+        # Removing most FAQs leaves enough unused terms to trigger compaction
+        while len(matcher.faqs) > 5:
+            matcher.remove_faq(0)
+            assert_matches_refit(matcher)
+        assert len(matcher.vectorizer.vocabulary_) < vocabulary_size
+        
+        matcher.compact()
+        assert np.all(matcher.vectorizer.idf_ > 0), "compact() should drop every unused term"
+        assert_matches_refit(matcher)
+        
+        faq = matcher.faqs[-1]
+        assert matcher.get_best_match(faq['question'])['question'] == faq['question']
+        print(f"✓ {engine}: vocabulary {vocabulary_size} -> {len(matcher.vectorizer.vocabulary_)} terms, scores match a full refit")
+
+def synthetic_faqs(count, words=1500, seed=0):
+    """FAQs of three random words each, with more distinct terms than max_features."""
+    rng = random.Random(seed)
+    faqs = []
+    for i in range(count):
+        question = ' '.join(f"w{rng.randrange(words)}" for _ in range(3))
+        faqs.append({'question': question, 'answer': f"Answer {i}", 'processed_question': question})
+    return faqs
+
+def assert_matches_recount(matcher):
+    """Check the FAQ vectors against counts recomputed over the matcher's current vocabulary."""
+    counter = CountVectorizer(analyzer=matcher.vectorizer.build_analyzer(), vocabulary=matcher.vectorizer.vocabulary_)
+    counts = counter.transform(matcher.faq_questions)
+    idf = smoothed_idf(np.bincount(counts.indices, minlength=counts.shape[1]), counts.shape[0])
+    assert np.allclose(matcher.vectorizer.idf_, idf), "IDF weights differ from a recount"
+    assert abs(matcher.faq_vectors - normalize(counts.multiply(idf))).max() < 1e-9, "FAQ vectors differ from a recount"
+
+def test_capped_vocabulary():
+    print("\n" + "=" * 60)
+    print("Testing Updates Past max_features:")
+    print("-" * 50)
+    
+    faqs = synthetic_faqs(3000)
+    # A rare bigram the capped fit leaves out, in three FAQs
+    for i in (10, 20, 30):
+        faqs[i]['question'] = faqs[i]['processed_question'] = f"{faqs[i]['question']} gift voucher"
+    matcher = FAQMatcher(faqs)
+    max_features = matcher.vectorizer.max_features
+    assert len(matcher.vectorizer.vocabulary_) == max_features
+    assert 'gift voucher' not in matcher.vectorizer.vocabulary_
+    
+    matcher.add_faq("gift voucher", "Gift vouchers never expire.")
+    column = matcher.vectorizer.vocabulary_['gift voucher']
+    assert matcher._document_frequency[column] == 4, "A term entering the vocabulary should be counted in every FAQ"
+    assert_matches_recount(matcher)
+    print(f"✓ add_faq counts terms the fit left out ({len(matcher.vectorizer.vocabulary_)} terms, cap {max_features})")
+    
+    matcher.update_faq(10, question="w1 w2 w3")
+    matcher.update_faq(20, question="gift voucher balance")
+    matcher.remove_faq(30)
+    assert matcher._document_frequency[matcher.vectorizer.vocabulary_['gift voucher']] == 2
+    assert_matches_recount(matcher)
+    
+    matcher.add_faq("w1 w2 balance", "Check your balance online.")
+    assert_matches_recount(matcher)
+    print("✓ update_faq and remove_faq keep the counts of promoted terms")
+
+if __name__ == "__main__":
+    test_incremental_updates()
+    test_incremental_updates('hashing')
+    test_compaction()
+    test_capped_vocabulary()
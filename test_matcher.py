@@ -145,6 +145,62 @@ def test_similarity_thresholds():
         else:
             print(f"Threshold {threshold}: ✗ No match found")
 
+def test_batch_matching():
+    print("\n" + "=" * 60)
+    print("Testing Batch Matching:")
+    print("-" * 50)
+    
+    matcher = FAQMatcher()
+    questions = [
+        "I forgot my password, how do I reset it?",
+        "Where is my order?",
+        "",
+        "xyz123",
+        "Do you deliver to other countries?"
+    ]
+    
+    batch_matches = matcher.get_best_matches(questions)
+    
+    for question, batch_match in zip(questions, batch_matches):
+        single_match = matcher.get_best_match(question)
+        same = (single_match is None and batch_match is None) or (
+            single_match is not None and batch_match is not None
+            and single_match['question'] == batch_match['question']
+            and abs(single_match['similarity_score'] - batch_match['similarity_score']) < 1e-9
+        )
+        assert same, f"Batch result differs for '{question}'"
+        
+        if batch_match:
+            print(f"✓ '{question}' -> '{batch_match['question']}' (Score: {batch_match['similarity_score']:.3f})")
+        else:
+            print(f"✓ '{question}' -> No match found")
+
+def test_inverted_engine():
+    print("\n" + "=" * 60)
+    print("Testing Inverted Index Engine:")
+    print("-" * 50)
+    
+    brute = FAQMatcher(engine='brute')
+    inverted = FAQMatcher(engine='inverted')
+    questions = [
+        "What about my order?",
+        "I forgot my password, how do I reset it?",
+        "Do you give discounts for large orders?",
+        "xyz123"
+    ]
+    
+    for question in questions:
+        brute_matches = brute.get_top_matches(question, top_k=5, threshold=0.0)
+        inverted_matches = inverted.get_top_matches(question, top_k=5, threshold=0.0)
+        
+        assert [m['question'] for m in brute_matches] == [m['question'] for m in inverted_matches], \
+            f"Engines disagree for '{question}'"
+        assert all(abs(b['similarity_score'] - i['similarity_score']) < 1e-9
+                   for b, i in zip(brute_matches, inverted_matches))
+        print(f"✓ '{question}': engines agree on {len(brute_matches)} matches")
+
 if __name__ == "__main__":
     test_question_matching()
     test_similarity_thresholds()
+    test_batch_matching()
+    test_inverted_engine()
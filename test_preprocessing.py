@@ -1,4 +1,6 @@
+import metrics
 from faqs import faqs
+from matcher import FAQMatcher
 from preprocess import preprocess_text, preprocess_faqs
 
 def test_preprocessing():
@@ -36,5 +38,27 @@ def test_preprocessing():
     
     return processed_faqs
 
+def test_stage_timers():
+    print("Testing Preprocessing Stage Timers")
+    print("=" * 50)
+    
+    metrics.enable()
+    metrics.reset()
+    try:
+        matcher = FAQMatcher(preprocess_faqs(faqs))
+        assert 'stage="tokenize"' not in metrics.render(), "Indexing FAQs should not record question stages"
+        print("✓ Building the index records no tokenize/lemmatize timings")
+        
+        matcher.get_best_match("Where is my order?")
+        matcher.get_top_matches("How do I reset my password?")
+        rendered = metrics.render()
+        for stage in ('tokenize', 'lemmatize'):
+            assert f'chatbot_stage_seconds_count{{stage="{stage}"}} 2' in rendered, f"{stage} should be timed per question"
+        print("✓ Each user question records one tokenize and one lemmatize timing")
+    finally:
+        metrics.reset()
+        metrics.enable(False)
+
 if __name__ == "__main__":
     processed_faqs = test_preprocessing()
+    test_stage_timers()
@@ -4,16 +4,26 @@ Test script for Streamlit app functionality
 This script tests the core components without running the full Streamlit interface.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from matcher import FAQMatcher
+from query_cache import QueryCache
+from streamlit_app import ANSWER_WORKERS, LATENCY_TARGET_MS, MATCH_THRESHOLD
 from datetime import datetime
+import os
+import tempfile
+import time
 
 def test_streamlit_functionality():
     """Test the core functionality that would be used in the Streamlit app."""
     print("🧪 Testing Streamlit App Functionality")
     print("=" * 50)
     
-    # Initialize matcher (same as in Streamlit app)
-    matcher = FAQMatcher()
+    # Initialize the shared matcher and answer threads (same as in Streamlit app),
+    # with the index saved to a temporary directory instead of the working tree
+    index_path = os.path.join(tempfile.mkdtemp(), 'faq_index')
+    matcher = FAQMatcher.load(index_path, cache=QueryCache(maxsize=256))
+    matcher.preprocessor.warm_up()
+    executor = ThreadPoolExecutor(max_workers=ANSWER_WORKERS)
     
     # Test questions (same as example questions in Streamlit app)
     test_questions = [
@@ -50,8 +60,10 @@ def test_streamlit_functionality():
         }
         chat_history.append(user_message)
         
-        # Get bot response (same as in Streamlit app)
-        match = matcher.get_best_match(question, threshold=0.1)
+        # Get bot response in the background (same as in Streamlit app)
+        started = time.perf_counter()
+        match = executor.submit(matcher.get_best_match, question, MATCH_THRESHOLD).result()
+        latency_ms = (time.perf_counter() - started) * 1000
         
         if match:
             response = match['answer']
@@ -68,6 +80,7 @@ def test_streamlit_functionality():
             'content': response,
             'similarity_score': similarity_score,
             'matched_question': matched_question,
+            'latency_ms': latency_ms,
             'timestamp': timestamp
         }
         chat_history.append(bot_message)
@@ -76,6 +89,9 @@ def test_streamlit_functionality():
         print(f"   📊 Similarity: {similarity_score:.3f}")
         if matched_question:
             print(f"   🔗 Matched: {matched_question}")
+        print(f"   ⏱️ Response time: {latency_ms:.1f} ms")
+    
+    executor.shutdown()
     
     # Test session statistics (same as in Streamlit sidebar)
     session_duration = datetime.now() - session_start
@@ -98,6 +114,11 @@ def test_streamlit_functionality():
     print(f"   Session Duration: {session_duration}")
     print(f"   Total Messages: {len(chat_history)}")
     
+    latencies = [msg['latency_ms'] for msg in chat_history if 'latency_ms' in msg]
+    avg_latency = sum(latencies) / len(latencies)
+    print(f"   Avg Response Time: {avg_latency:.1f} ms (target {LATENCY_TARGET_MS} ms)")
+    assert avg_latency < LATENCY_TARGET_MS, "Answers should arrive within the latency target"
+    
     print(f"\n✅ Streamlit functionality test completed!")
     print(f"💡 The Streamlit app should work correctly with these components.")
     print(f"🌐 Run 'streamlit run streamlit_app.py' to start the web interface.")
@@ -1,50 +1,248 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 from matcher import FAQMatcher
+from query_cache import QueryCache
+from faq_index import FAQS_SOURCE, read_faqs_source
+from faq_sources import open_source
+from faq_reloader import MatcherHolder
+from profiling import RequestProfiler, parse_modes
+import metrics
 from datetime import datetime
+from itertools import islice
+import hmac
 import json
+import os
+
+# Repeated questions are answered from the cache for up to an hour
+CACHE_SIZE = 4096
+CACHE_TTL = 3600
+
+# Limits of the /ask/batch endpoint, and how many questions are scored per matcher call
+MAX_BATCH_QUESTIONS = 10000
+MAX_BATCH_BYTES = 4 * 1024 * 1024
+BATCH_CHUNK_SIZE = 256
+
+# Seconds between checks of faqs.py for changes (0 disables the watcher), and
+# the token required by the /admin endpoints (they are disabled when unset)
+RELOAD_INTERVAL = float(os.environ.get('CHATBOT_RELOAD_INTERVAL', 0))
+ADMIN_TOKEN = os.environ.get('CHATBOT_ADMIN_TOKEN')
+
+# JSONL, CSV or SQLite knowledge base to serve instead of faqs.py
+FAQ_SOURCE = os.environ.get('CHATBOT_FAQ_SOURCE')
+
+# Directory of the saved FAQ index (default: faq_index/ next to faq_index.py)
+INDEX_PATH = os.environ.get('CHATBOT_INDEX_PATH')
+
+# Per-stage latency histograms and answer counters for /metrics (CHATBOT_METRICS=0 turns them off)
+METRICS_ENABLED = os.environ.get('CHATBOT_METRICS', '1') != '0'
+metrics.enable(METRICS_ENABLED)
+
+# Live request profiling: share of /ask requests sampled (0 = only on request),
+# the modes used for sampled requests, the most requests profiled per minute,
+# and where aggregated stats are written (optional; also served at /admin/profile)
+PROFILE_SAMPLE_RATE = float(os.environ.get('CHATBOT_PROFILE_SAMPLE_RATE', 0))
+PROFILE_SAMPLE_MODES = parse_modes(os.environ.get('CHATBOT_PROFILE_MODES', 'cpu'))
+PROFILE_MAX_PER_MINUTE = int(os.environ.get('CHATBOT_PROFILE_MAX_PER_MINUTE', 6))
+PROFILE_DIR = os.environ.get('CHATBOT_PROFILE_DIR')
+
+profiler = RequestProfiler(PROFILE_SAMPLE_RATE, PROFILE_SAMPLE_MODES, PROFILE_MAX_PER_MINUTE, PROFILE_DIR)
 
 app = Flask(__name__)
-matcher = FAQMatcher()
+# Also bounds bodies sent without a Content-Length (chunked encoding) where
+# the server supports it; /ask/batch counts NDJSON bytes itself as well
+app.config['MAX_CONTENT_LENGTH'] = MAX_BATCH_BYTES
+
+def load_matcher():
+    """
+    Load the matcher for FAQ_SOURCE (or faqs.py) as it is on disk now.
+    
+    Uses the memory-mapped index (rebuilt when the FAQs changed) instead of
+    refitting TF-IDF.
+    
+    Returns:
+        tuple: (FAQMatcher, index version)
+    """
+    cache = QueryCache(maxsize=CACHE_SIZE, ttl=CACHE_TTL)
+    if FAQ_SOURCE:
+        source = open_source(FAQ_SOURCE)
+        source_hash = source.content_hash()
+        matcher = FAQMatcher.load(INDEX_PATH, source=source, source_hash=source_hash, cache=cache)
+    else:
+        faqs, source_hash = read_faqs_source()
+        matcher = FAQMatcher.load(INDEX_PATH, faqs=faqs, source_hash=source_hash, cache=cache)
+    return matcher, source_hash[:12]
+
+# Requests take the current matcher once and use it until they finish, so a
+# reload never changes the index under a request in flight
+knowledge_base = MatcherHolder(load_matcher)
+
+# Replaces knowledge_base.reload() for POST /admin/reload when set; prefork_server.py
+# uses it to have the parent rebuild the index once and reload every worker
+reload_hook = None
+
+def faq_source_path():
+    """The file the FAQs are loaded from: FAQ_SOURCE, or faqs.py."""
+    return FAQ_SOURCE or FAQS_SOURCE
+
+def start_faq_watcher():
+    """
+    Start reloading the FAQs when their source file changes, if RELOAD_INTERVAL is set.
+    
+    Does nothing while reload_hook is set, as reloads are then coordinated
+    by whoever set it (the pre-fork parent watches the file itself).
+    """
+    if RELOAD_INTERVAL > 0 and reload_hook is None:
+        knowledge_base.watch(faq_source_path(), RELOAD_INTERVAL)
+
+def request_reload():
+    """
+    Start reloading the FAQ index of the server.
+    
+    Returns:
+        bool: False if a reload was already running
+    """
+    if reload_hook is not None:
+        return reload_hook()
+    return knowledge_base.reload()
+
+def is_admin_token(token):
+    """Check a token against ADMIN_TOKEN in constant time."""
+    if not ADMIN_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode('utf-8'), ADMIN_TOKEN.encode('utf-8'))
+
+def requested_profile_modes(headers):
+    """
+    Get the profiling modes an admin asked for with the X-Profile header (e.g. 'cpu,memory').
+    
+    Args:
+        headers (Mapping): Request headers supporting .get()
+    
+    Returns:
+        frozenset: Requested modes, empty unless the request carries the admin token
+    """
+    if not headers.get('X-Profile') or not is_admin_token(headers.get('X-Admin-Token')):
+        return frozenset()
+    return parse_modes(headers.get('X-Profile'))
+
+def parse_profile_limit(value, default=20):
+    """
+    Parse the limit query parameter of GET /admin/profile.
+    
+    Args:
+        value (str): Parameter value, or None if it was not given
+        default (int): Limit used when no value was given
+    
+    Returns:
+        int: Number of functions and allocation sites to report, or None if
+             value is not a positive integer
+    """
+    if value is None:
+        return default
+    try:
+        limit = int(value)
+    except ValueError:
+        return None
+    return limit if limit > 0 else None
+
+@app.before_request
+def ensure_faq_watcher():
+    """
+    Start the FAQ watcher with the first request of each process.
+    
+    Not started on import, so the parent of pre-forked workers, which
+    serves no requests, does not rebuild indexes nobody uses.
+    """
+    start_faq_watcher()
 
 @app.route('/')
 def index():
     """Main page with chatbot interface."""
     return render_template('index.html')
 
+EXAMPLE_QUESTIONS = [
+    "How can I reset my password?",
+    "What are your business hours?",
+    "How do I track my order?",
+    "What is your return policy?",
+    "Do you ship internationally?",
+    "How can I contact customer support?",
+    "What payment methods do you accept?",
+    "How long does shipping take?",
+    "Can I cancel my order?",
+    "Do you offer discounts for bulk orders?"
+]
+
+def answer_question(question):
+    """
+    Build the /ask response payload for a question.
+    
+    Shared by the Flask app and the ASGI serving mode.
+    
+    Args:
+        question (str): Raw user question
+        
+    Returns:
+        dict: JSON-serializable response
+    """
+    question = (question or '').strip()
+    
+    if not question:
+        return {
+            'success': False,
+            'error': 'Please provide a question.'
+        }
+    
+    # Get the best match
+    started = metrics.start()
+    current = knowledge_base.current
+    match = current.matcher.get_best_match(question, threshold=0.1)
+    answer = format_answer(question, match, current.version)
+    metrics.lap('request', started)
+    return answer
+
+def format_answer(question, match, index_version=None):
+    """
+    Build the response payload for a question and its best match.
+    
+    Args:
+        question (str): Stripped user question
+        match (dict): Best matching FAQ, or None
+        index_version (str): Version of the FAQ index that answered
+        
+    Returns:
+        dict: JSON-serializable response
+    """
+    metrics.increment('chatbot_answers_total', outcome='matched' if match else 'no_match')
+    if match:
+        return {
+            'success': True,
+            'answer': match['answer'],
+            'similarity_score': round(float(match['similarity_score']), 3),
+            'matched_question': match['question'],
+            'user_question': question,
+            'index_version': index_version,
+            'timestamp': datetime.now().strftime('%H:%M:%S')
+        }
+    else:
+        return {
+            'success': False,
+            'error': "I'm sorry, I couldn't find a relevant answer. Please try rephrasing your question.",
+            'user_question': question,
+            'index_version': index_version,
+            'timestamp': datetime.now().strftime('%H:%M:%S')
+        }
+
 @app.route('/ask', methods=['POST'])
 def ask_question():
     """Handle question requests."""
     try:
         data = request.get_json()
-        question = data.get('question', '').strip()
-        
-        if not question:
-            return jsonify({
-                'success': False,
-                'error': 'Please provide a question.'
-            })
-        
-        # Get the best match
-        match = matcher.get_best_match(question, threshold=0.1)
-        
-        if match:
-            response = {
-                'success': True,
-                'answer': match['answer'],
-                'similarity_score': round(match['similarity_score'], 3),
-                'matched_question': match['question'],
-                'user_question': question,
-                'timestamp': datetime.now().strftime('%H:%M:%S')
-            }
-        else:
-            response = {
-                'success': False,
-                'error': "I'm sorry, I couldn't find a relevant answer. Please try rephrasing your question.",
-                'user_question': question,
-                'timestamp': datetime.now().strftime('%H:%M:%S')
-            }
-        
-        return jsonify(response)
+        modes = profiler.select(requested_profile_modes(request.headers))
+        answer, profiled = profiler.run(modes, answer_question, data.get('question', ''))
+        response = jsonify(answer)
+        if profiled:
+            response.headers['X-Profiled'] = ','.join(sorted(profiled))
+        return response
         
     except Exception as e:
         return jsonify({
@@ -52,22 +250,191 @@ def ask_question():
             'error': f'Sorry, something went wrong: {str(e)}'
         })
 
+def iter_ndjson_lines(stream, limit=MAX_BATCH_BYTES):
+    """
+    Read the non-empty lines of an NDJSON body, at most limit bytes in total.
+    
+    Lines are read with a bounded readline, so a body without line breaks
+    or a Content-Length is never read into memory whole.
+    
+    Raises:
+        OverflowError: If the body is larger than limit
+    """
+    total = 0
+    while True:
+        line = stream.readline(limit - total + 1)
+        if not line:
+            return
+        total += len(line)
+        if total > limit:
+            raise OverflowError(f'Batch larger than {limit} bytes.')
+        if line.strip():
+            yield line
+
+def iter_batch_questions():
+    """
+    Parse the questions of a /ask/batch request.
+    
+    Accepts a JSON array (or {"questions": [...]}) or an NDJSON stream,
+    where each item is a question string or an object with 'question'
+    and an optional 'id'. NDJSON is read line by line from the request.
+    
+    Yields:
+        tuple: (id, question), with question None for an unparsable item
+               or one whose question is not a string
+    
+    Raises:
+        OverflowError: If the batch has too many questions or bytes
+    """
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        items = iter_ndjson_lines(request.stream, MAX_BATCH_BYTES)
+        parse = json.loads
+    else:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            data = data.get('questions')
+        if not isinstance(data, list):
+            raise ValueError('Expected a JSON array of questions.')
+        if len(data) > MAX_BATCH_QUESTIONS:
+            raise OverflowError(f'At most {MAX_BATCH_QUESTIONS} questions per batch.')
+        items = data
+        parse = None
+    
+    for index, item in enumerate(items):
+        try:
+            if parse is not None:
+                item = parse(item)
+            if isinstance(item, dict):
+                question_id, question = item.get('id', index), item.get('question', '')
+            else:
+                question_id, question = index, item
+            yield question_id, question if isinstance(question, str) else None
+        except ValueError:
+            yield index, None
+
+@app.route('/ask/batch', methods=['POST'])
+def ask_batch():
+    """
+    Answer many questions in one request.
+    
+    Questions are scored in chunks with one vectorized matcher call per
+    chunk, and results are streamed back as NDJSON in input order.
+    """
+    if request.content_length is not None and request.content_length > MAX_BATCH_BYTES:
+        return jsonify({'success': False, 'error': f'Batch larger than {MAX_BATCH_BYTES} bytes.'}), 413
+    
+    try:
+        questions = iter_batch_questions()
+        first_chunk = list(islice(questions, BATCH_CHUNK_SIZE))
+    except OverflowError as e:
+        return jsonify({'success': False, 'error': str(e)}), 413
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    # The whole batch is answered by the index that was current when it arrived
+    current = knowledge_base.current
+    
+    def generate():
+        chunk = first_chunk
+        total = 0
+        while chunk:
+            total += len(chunk)
+            if total > MAX_BATCH_QUESTIONS:
+                yield json.dumps({'success': False, 'error': f'At most {MAX_BATCH_QUESTIONS} questions per batch.'}) + '\n'
+                return
+            
+            texts = [(question or '').strip() for _, question in chunk]
+            matches = current.matcher.get_best_matches(texts, threshold=0.1)
+            
+            for (question_id, question), text, match in zip(chunk, texts, matches):
+                if question is None:
+                    result = {'success': False, 'error': 'Invalid question: expected a string.'}
+                elif not text:
+                    result = {'success': False, 'error': 'Please provide a question.'}
+                else:
+                    result = format_answer(text, match, current.version)
+                result['id'] = question_id
+                yield json.dumps(result) + '\n'
+            
+            try:
+                chunk = list(islice(questions, BATCH_CHUNK_SIZE))
+            except OverflowError as e:
+                yield json.dumps({'success': False, 'error': str(e)}) + '\n'
+                return
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @app.route('/examples')
 def get_examples():
     """Get example questions."""
-    examples = [
-        "How can I reset my password?",
-        "What are your business hours?",
-        "How do I track my order?",
-        "What is your return policy?",
-        "Do you ship internationally?",
-        "How can I contact customer support?",
-        "What payment methods do you accept?",
-        "How long does shipping take?",
-        "Can I cancel my order?",
-        "Do you offer discounts for bulk orders?"
+    return jsonify({'examples': EXAMPLE_QUESTIONS})
+
+def metrics_gauges():
+    """
+    Point-in-time values of the serving index and query cache for /metrics.
+    
+    Returns:
+        list: (name, help, value) tuples
+    """
+    matcher = knowledge_base.matcher
+    gauges = [
+        ('chatbot_index_faqs', 'FAQs in the serving index', len(matcher.faqs)),
+        ('chatbot_index_text_bytes', 'Bytes of FAQ text in the serving index', matcher.faqs.nbytes),
+        ('chatbot_index_features', 'Columns of the FAQ vectors', matcher.faq_vectors.shape[1]),
+        ('chatbot_index_nonzeros', 'Non-zero entries of the FAQ vectors', matcher.faq_vectors.nnz),
+        ('chatbot_index_reloads', 'Index reloads since start-up', knowledge_base.reloads)
     ]
-    return jsonify({'examples': examples})
+    
+    cache = matcher.cache
+    if cache is not None:
+        lookups = cache.hits + cache.misses
+        gauges += [
+            ('chatbot_cache_hits', 'Query cache hits of the serving index', cache.hits),
+            ('chatbot_cache_misses', 'Query cache misses of the serving index', cache.misses),
+            ('chatbot_cache_hit_ratio', 'Share of query cache lookups that hit', cache.hits / lookups if lookups else 0)
+        ]
+    
+    matched = metrics.counter_value('chatbot_answers_total', outcome='matched')
+    unmatched = metrics.counter_value('chatbot_answers_total', outcome='no_match')
+    if matched + unmatched:
+        gauges.append(('chatbot_no_match_ratio', 'Share of answered questions without a match',
+                       unmatched / (matched + unmatched)))
+    return gauges
+
+@app.route('/metrics')
+def get_metrics():
+    """Per-stage latency histograms, answer counters and index gauges in Prometheus text format."""
+    return Response(metrics.render(metrics_gauges()), mimetype='text/plain; version=0.0.4')
+
+@app.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    """Rebuild the FAQ index from its source in the background and swap it in."""
+    if not is_admin_token(request.headers.get('X-Admin-Token')):
+        return jsonify({'success': False, 'error': 'Not authorized.'}), 403
+    
+    started = request_reload()
+    return jsonify({'success': True, 'started': started, **knowledge_base.status()}), 202
+
+@app.route('/admin/index')
+def admin_index():
+    """Report the serving index version and reload state."""
+    if not is_admin_token(request.headers.get('X-Admin-Token')):
+        return jsonify({'success': False, 'error': 'Not authorized.'}), 403
+    return jsonify(knowledge_base.status())
+
+@app.route('/admin/profile', methods=['GET', 'DELETE'])
+def admin_profile():
+    """Report (GET) or clear (DELETE) the aggregated profiles of live requests."""
+    if not is_admin_token(request.headers.get('X-Admin-Token')):
+        return jsonify({'success': False, 'error': 'Not authorized.'}), 403
+    
+    if request.method == 'DELETE':
+        profiler.reset()
+        return jsonify({'success': True})
+    limit = parse_profile_limit(request.args.get('limit'))
+    if limit is None:
+        return jsonify({'success': False, 'error': 'limit must be a positive integer.'}), 400
+    return jsonify(profiler.summary(limit))
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)